@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import time
+import math
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CRAWLER_DIR = os.path.join(ROOT, "naver_api_news_full_crawling")
+ANALYZER_DIR = os.path.join(ROOT, "bert")
+WORK_DIR = os.path.join(ROOT, "bench", ".work")        # 코퍼스, 스텁 모델 등 생성물
+RESULTS_DIR = os.path.join(ROOT, "bench", "results")   # 실행별 결과 JSON
+
+RESULT_PREFIX = "BENCH_RESULT "  # 스테이지 프로세스가 결과를 알리는 stdout 줄 머리
+
+
+def use_project(project_dir: str):
+    """ 두 프로젝트 모두 패키지 이름이 src 이므로, 스테이지 프로세스마다 하나만 import 경로에 올림 """
+    sys.path.insert(0, project_dir)
+    os.chdir(project_dir)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """ 선형 보간 백분위수 (numpy 없이) """
+    if not values:
+        return float("nan")
+    xs = sorted(values)
+    k = (len(xs) - 1) * q / 100
+    lo, hi = math.floor(k), math.ceil(k)
+    return xs[lo] + (xs[hi] - xs[lo]) * (k - lo)
+
+
+def summarize(latencies: Iterable[float], items: int, wall: float) -> Dict[str, float]:
+    """ 스테이지 결과: 처리량(items/s)과 지연 시간 백분위수(ms) """
+    lat = list(latencies)
+    latency_ms = {f"p{q}": round(percentile(lat, q) * 1000, 3) for q in (50, 90, 99)}
+    latency_ms["max"] = round(max(lat) * 1000, 3) if lat else float("nan")
+    latency_ms["n"] = len(lat)
+    return {
+        "items": items,
+        "wall_sec": round(wall, 4),
+        "throughput": round(items / wall, 2) if wall > 0 else 0.0,
+        "latency_ms": latency_ms,
+    }
+
+
+class Stopwatch:
+    """ 구간별 지연 시간 기록기 """
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def lap(self):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.append(time.perf_counter() - t)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+def emit(stage: str, result: Optional[Dict] = None, error: Optional[str] = None):
+    """ 스테이지 결과를 부모 프로세스(run.py)로 전달 """
+    payload = {"stage": stage, "result": result, "error": error}
+    print(RESULT_PREFIX + json.dumps(payload, ensure_ascii=False), flush=True)
@@ -0,0 +1,94 @@
+import os
+import csv
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from .common import ANALYZER_DIR
+
+## 합성 한국어 경제 기사 코퍼스
+## - 섹터 키워드 사전(bert/src/11sector_keyword.csv)의 키워드를 문장 템플릿에 채워 기사 본문을 생성
+## - dup_rate 비율만큼 앞선 기사를 살짝 고친 통신사 전재본을 섞어 근사 중복 처리도 측정할 수 있게 함
+## - seed 가 같으면 항상 같은 코퍼스를 만든다
+
+KST = timezone(timedelta(hours=9))
+KEYWORD_CSV = os.path.join(ANALYZER_DIR, "src", "11sector_keyword.csv")
+
+_COMPANIES = ["한빛전자", "대한중공업", "미래금융지주", "새솔바이오", "동해에너지", "청운건설",
+              "누리통신", "가온유통", "푸른제약", "세움반도체", "라온모빌리티", "하늘항공"]
+_TEMPLATES = [
+    "{company}는 {kw} 사업 부문에서 전년 대비 {pct}% 증가한 {amount}억원의 매출을 기록했다고 밝혔다.",
+    "시장에서는 {kw} 수요가 {quarter}분기 이후 회복될 것이라는 전망이 우세하다.",
+    "증권가는 {company}의 {kw} 관련 투자가 중장기 실적 개선으로 이어질 것으로 내다봤다.",
+    "정부는 {kw} 산업 경쟁력 강화를 위해 {amount}억원 규모의 지원 방안을 발표했다.",
+    "{company} 주가는 {kw} 업황 우려로 장중 {pct}% 하락했다가 낙폭을 일부 만회했다.",
+    "전문가들은 금리와 환율 변동성이 {kw} 업종의 수익성에 부담이 될 수 있다고 지적했다.",
+    "{company} 관계자는 \"{kw} 분야의 기술 경쟁력을 바탕으로 해외 시장을 넓혀 가겠다\"고 말했다.",
+    "외국인 투자자는 이날 {kw} 관련 종목을 {amount}억원어치 순매수했다.",
+]
+_WIRES = ["[연합뉴스]", "[뉴시스]", "[뉴스1]"]
+
+
+def load_keywords(path: str = KEYWORD_CSV) -> Dict[str, List[str]]:
+    sectors: Dict[str, List[str]] = {}
+    with open(path, encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            sectors.setdefault(row["섹터"], []).append(row["키워드"])
+    return sectors
+
+
+def _sentence(rng: random.Random, kw: str) -> str:
+    return rng.choice(_TEMPLATES).format(
+        company=rng.choice(_COMPANIES), kw=kw, pct=rng.randint(1, 40),
+        amount=rng.randint(10, 9000), quarter=rng.randint(1, 4),
+    )
+
+
+def make_corpus(n: int, seed: int = 7, paragraphs: int = 6, dup_rate: float = 0.15,
+                start: Optional[datetime] = None) -> List[Dict]:
+    """ 합성 기사 n 건 (최신순). 각 기사는 id, title, body, sector, published(KST datetime), dup_of 를 가짐 """
+    rng = random.Random(seed)
+    sectors = load_keywords()
+    names = list(sectors)
+    start = start or datetime(2025, 9, 30, 18, 0, tzinfo=KST)
+
+    articles: List[Dict] = []
+    for i in range(n):
+        published = start - timedelta(minutes=7 * i + rng.randint(0, 6))
+        if articles and rng.random() < dup_rate:
+            # 통신사 전재본: 본문 단어 하나만 바꾸고 머리말과 제목을 달리함
+            src = rng.choice(articles[-50:])
+            words = src["body"].split(" ")
+            words[rng.randrange(len(words))] = "수정"
+            articles.append({
+                "id": i, "sector": src["sector"], "published": published, "dup_of": src["id"],
+                "title": f"{rng.choice(_WIRES)} {src['title']}",
+                "body": f"{rng.choice(_WIRES)} " + " ".join(words),
+            })
+            continue
+
+        sector = rng.choice(names)
+        kws = sectors[sector]
+        paras = []
+        for _ in range(paragraphs):
+            # 주 섹터 키워드 위주로, 가끔 다른 섹터 키워드를 섞음
+            picks = [rng.choice(kws) if rng.random() < 0.8 else rng.choice(sectors[rng.choice(names)])
+                     for _ in range(rng.randint(3, 5))]
+            paras.append(" ".join(_sentence(rng, kw) for kw in picks))
+        articles.append({
+            "id": i, "sector": sector, "published": published, "dup_of": None,
+            "title": f"{rng.choice(_COMPANIES)}, {rng.choice(kws)} 실적 {rng.choice(['호조', '부진', '전망'])}",
+            "body": "\n".join(paras),
+        })
+    return articles
+
+
+def write_news_csv(articles: List[Dict], path: str):
+    """ 크롤러 출력과 같은 컬럼 구성의 뉴스 CSV 기록 (분석기 벤치마크 입력) """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "query", "title", "body_full", "extractor_used", "published_at_kst"])
+        for a in articles:
+            writer.writerow([a["id"], "벤치마크", a["title"], a["body"], "synthetic",
+                             a["published"].strftime("%Y-%m-%d %H:%M:%S%z")])
@@ -0,0 +1,183 @@
+import json
+import time
+import random
+import threading
+import html as html_lib
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+from typing import Dict, List, Tuple
+
+## 로컬 Naver 검색 API + 언론사 페이지 스탠드인
+## - API 서버(127.0.0.1)는 /v1/search/news.json 의 display/start/sort 페이징을 흉내냄 (start 최대 1000)
+## - 언론사 서버는 127.0.0.2, 127.0.0.3, ... 에 하나씩 떠서 크롤러의 호스트별 스로틀/커넥션 풀이 실제처럼 동작
+## - 기사 페이지는 지연 시간, 페이지 크기(광고/스크립트 군더더기), 오류율을 설정할 수 있음
+## - 기사 id 에 따라 Content-Type charset / <meta charset>(cp949) / 선언 없음 을 돌아가며 사용
+
+_BLOAT = ("<div class=\"ad\"><script>window.adslot=window.adslot||[];adslot.push({{id:{n}}});</script>"
+          "<a href=\"/ranking\">많이 본 뉴스 {n}</a><span>관련 기사 더보기</span></div>\n")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeNaver:
+    """ 벤치마크용 로컬 Naver API / 언론사 서버 묶음 (with 문으로 사용) """
+
+    def __init__(self, articles: List[Dict], hosts: int = 4, latency_ms: Tuple[float, float] = (20, 80),
+                 error_rate: float = 0.02, bloat_kb: int = 30, seed: int = 7):
+        self.articles = articles
+        self.by_id = {a["id"]: a for a in articles}
+        self.hosts = hosts
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.bloat_kb = bloat_kb
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._servers: List[ThreadingHTTPServer] = []
+        self.publishers: List[str] = []
+        self.api_url = ""
+        self.stats = {"api": 0, "page": 0, "error": 0, "not_modified": 0}
+        self._stats_lock = threading.Lock()
+
+    # --- 서버 수명 ---
+    def start(self) -> "FakeNaver":
+        api = self._serve("127.0.0.1", self._api_handler())
+        self.api_url = f"http://127.0.0.1:{api.server_address[1]}/v1/search/news.json"
+        page_handler = self._page_handler()
+        for k in range(self.hosts):
+            srv = self._serve(f"127.0.0.{k + 2}", page_handler)
+            self.publishers.append(f"http://127.0.0.{k + 2}:{srv.server_address[1]}")
+        return self
+
+    def close(self):
+        for srv in self._servers:
+            srv.shutdown()
+            srv.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _serve(self, host: str, handler) -> ThreadingHTTPServer:
+        srv = _Server((host, 0), handler)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        self._servers.append(srv)
+        return srv
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def article_url(self, article_id: int) -> str:
+        return f"{self.publishers[article_id % self.hosts]}/news/{article_id}"
+
+    # --- API ---
+    def _search(self, display: int, start: int, sort: str) -> Dict:
+        order = self.articles
+        if sort == "sim":
+            order = sorted(self.articles, key=lambda a: (a["id"] * 2654435761) % 4294967296)
+        page = order[start - 1:start - 1 + display]
+        return {
+            "lastBuildDate": format_datetime(self.articles[0]["published"]) if self.articles else "",
+            "total": len(self.articles),
+            "start": start,
+            "display": len(page),
+            "items": [{
+                "title": f"<b>{html_lib.escape(a['title'])}</b>",
+                "originallink": self.article_url(a["id"]),
+                "link": self.article_url(a["id"]),
+                "description": html_lib.escape(a["body"][:120]),
+                "pubDate": format_datetime(a["published"]),
+            } for a in page],
+        }
+
+    def _api_handler(self):
+        bench = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                bench._count("api")
+                q = dict(parse_qsl(urlsplit(self.path).query))
+                display = min(int(q.get("display", 10)), 100)
+                start = int(q.get("start", 1))
+                if start > 1000 or display < 1:
+                    body, status = {"errorMessage": "Invalid start value", "errorCode": "SE03"}, 400
+                else:
+                    body, status = bench._search(display, start, q.get("sort", "sim")), 200
+                raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    # --- 언론사 페이지 ---
+    def render_page(self, article: Dict) -> Tuple[bytes, str]:
+        """ 기사 HTML 과 Content-Type (id 에 따라 인코딩 선언 방식을 바꿈) """
+        variant = article["id"] % 3
+        meta = "<meta charset=\"euc-kr\">" if variant == 1 else ""
+        paras = "".join(f"<p>{html_lib.escape(p)}</p>" for p in article["body"].split("\n"))
+        bloat = "".join(_BLOAT.format(n=n) for n in range(max(1, self.bloat_kb * 1024 // len(_BLOAT))))
+        page = (f"<!DOCTYPE html><html lang=\"ko\"><head>{meta}<title>{html_lib.escape(article['title'])}</title>"
+                f"<style>.ad{{display:none}}</style></head><body><header><nav>홈 | 경제 | 증권 | 산업</nav></header>"
+                f"{bloat[:len(bloat) // 2]}<article><h1>{html_lib.escape(article['title'])}</h1>"
+                f"<div id=\"articleBody\">{paras}</div></article><!-- 기사 끝 -->"
+                f"{bloat[len(bloat) // 2:]}<footer>Copyright 벤치마크신문</footer></body></html>")
+        if variant == 0:
+            return page.encode("utf-8"), "text/html; charset=utf-8"
+        if variant == 1:
+            return page.encode("cp949", errors="replace"), "text/html"
+        return page.encode("utf-8"), "text/html"
+
+    def _page_handler(self):
+        bench = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: bytes = b"", headers: Dict[str, str] = None):
+                self.send_response(status)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                bench._count("page")
+                with bench._rng_lock:
+                    delay = bench._rng.uniform(*bench.latency_ms) / 1000
+                    fail = bench._rng.random() < bench.error_rate
+                time.sleep(delay)
+
+                try:
+                    article = bench.by_id[int(self.path.rsplit("/", 1)[-1])]
+                except (ValueError, KeyError):
+                    return self._send(404)
+                if fail:
+                    bench._count("error")
+                    return self._send(503 if article["id"] % 2 else 403)
+
+                etag = f"\"a{article['id']}\""
+                if self.headers.get("If-None-Match") == etag:
+                    bench._count("not_modified")
+                    return self._send(304, headers={"ETag": etag})
+                body, content_type = bench.render_page(article)
+                self._send(200, body, {"Content-Type": content_type, "ETag": etag})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,141 @@
+import os
+import sys
+import glob
+import json
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+from typing import Dict, Optional
+
+from .common import ROOT, RESULTS_DIR, RESULT_PREFIX
+
+## 오프라인 벤치마크 진입점 (저장소 루트에서 실행)
+##   python -m bench.run                          # 전체 스테이지
+##   python -m bench.run --stages harvest extract --articles 300
+##   python -m bench.run --compare latest         # 직전 결과와 비교
+## 스테이지마다 별도 프로세스로 실행하므로 두 프로젝트의 src 패키지가 섞이지 않는다.
+
+STAGE_MODULES = {
+    "harvest": "bench.stage_crawler",
+    "extract": "bench.stage_crawler",
+    "classify": "bench.stage_analyzer",
+    "neardup": "bench.stage_analyzer",
+    "sentiment": "bench.stage_analyzer",
+    "fused": "bench.stage_analyzer",
+}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="크롤러/분석기 오프라인 벤치마크")
+    p.add_argument("--stages", nargs="+", default=list(STAGE_MODULES), choices=list(STAGE_MODULES))
+    p.add_argument("--articles", type=int, default=500, help="합성 기사 수")
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--dup-rate", type=float, default=0.15, help="통신사 전재(근사 중복) 기사 비율")
+    # 로컬 언론사 서버
+    p.add_argument("--hosts", type=int, default=4, help="언론사 호스트 수 (127.0.0.2 부터)")
+    p.add_argument("--latency-ms", type=float, nargs=2, default=[20, 80], metavar=("MIN", "MAX"))
+    p.add_argument("--error-rate", type=float, default=0.02)
+    p.add_argument("--bloat-kb", type=int, default=30, help="기사 페이지에 덧붙일 광고/스크립트 분량")
+    # 크롤러
+    p.add_argument("--workers", type=int, default=8, help="스크래핑 스레드 수")
+    p.add_argument("--host-interval", type=float, default=0.0, help="호스트별 요청 간격(초)")
+    # 분석기
+    p.add_argument("--chunksize", type=int, default=200)
+    p.add_argument("--classify-workers", type=int, default=1)
+    p.add_argument("--batch-size", type=int, default=16)
+    p.add_argument("--max-length", type=int, default=256)
+    p.add_argument("--near-dup-threshold", type=float, default=0.8)
+    # 결과
+    p.add_argument("--tag", default="", help="결과 파일명에 붙일 꼬리표")
+    p.add_argument("--compare", default=None, help="비교할 결과 JSON 경로 또는 latest")
+    p.add_argument("--no-save", action="store_true")
+    return p.parse_args(argv)
+
+
+def run_stage(stage: str, params: dict) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONHASHSEED="0")
+    proc = subprocess.run([sys.executable, "-m", STAGE_MODULES[stage], stage, json.dumps(params)],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    tail = (proc.stderr or proc.stdout).strip().splitlines()[-3:]
+    return {"stage": stage, "result": None, "error": " | ".join(tail) or f"exit {proc.returncode}"}
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except OSError:
+        return "unknown"
+
+
+def latest_result(exclude: Optional[str] = None) -> Optional[str]:
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if p != exclude)
+    return paths[-1] if paths else None
+
+
+def print_report(report: Dict, baseline: Optional[Dict] = None):
+    base = (baseline or {}).get("stages", {})
+    if baseline and baseline.get("params") != report["params"]:
+        changed = sorted(k for k in report["params"] if baseline.get("params", {}).get(k) != report["params"][k])
+        print(f"[bench] 주의: 비교 기준과 설정이 다름 ({', '.join(changed)})")
+    print(f"\n{'stage':<10} {'items/s':>10} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10}  비교")
+    for stage, entry in report["stages"].items():
+        res = entry.get("result")
+        if not res:
+            print(f"{stage:<10} 실패: {entry.get('error')}")
+            continue
+        lat = res["latency_ms"]
+        line = f"{stage:<10} {res['throughput']:>10.1f} {lat['p50']:>10.2f} {lat['p90']:>10.2f} {lat['p99']:>10.2f}"
+        prev = (base.get(stage) or {}).get("result")
+        if prev and prev.get("throughput"):
+            change = (res["throughput"] / prev["throughput"] - 1) * 100
+            p50 = prev["latency_ms"]["p50"]
+            p50_change = (lat["p50"] / p50 - 1) * 100 if p50 else float("nan")
+            line += f"  처리량 {change:+.1f}%, p50 {p50_change:+.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    params = {k: v for k, v in vars(args).items() if k not in ("stages", "tag", "compare", "no_save")}
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpu)",
+        "params": params,
+        "stages": {},
+    }
+    for stage in args.stages:
+        print(f"[bench] {stage} ...", flush=True)
+        entry = run_stage(stage, params)
+        report["stages"][stage] = {"result": entry.get("result"), "error": entry.get("error")}
+
+    path = None
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"{stamp}_{report['git']}{'_' + args.tag if args.tag else ''}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    compare = latest_result(exclude=path) if args.compare == "latest" else args.compare
+    if compare:
+        with open(compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n[bench] 비교 기준: {compare}")
+    print_report(report, baseline)
+    if path:
+        print(f"\n[bench] 결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
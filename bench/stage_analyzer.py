@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import time
+
+from .common import ANALYZER_DIR, WORK_DIR, Stopwatch, summarize, emit, use_project
+from .corpus import make_corpus, write_news_csv
+from .tiny_model import build_tiny_model, model_info
+
+## 분석기 스테이지 (run.py 가 스테이지마다 별도 프로세스로 실행)
+##   classify  : classify_news_csv (기사당 섹터 매칭 지연 시간)
+##   neardup   : 근사 중복 묶기 (기사당 MinHash/LSH 지연 시간)
+##   sentiment : 스텁 모델로 run_bert_sentiment (배치당 추론 지연 시간)
+##   fused     : 스텁 모델로 run_news_pipeline 전체 (청크당 지연 시간)
+
+
+def _corpus_csv(params: dict):
+    articles = make_corpus(params["articles"], seed=params["seed"], dup_rate=params["dup_rate"])
+    path = os.path.join(WORK_DIR, f"news_{params['articles']}_{params['seed']}.csv")
+    write_news_csv(articles, path)
+    return articles, path
+
+
+def _engine(articles, params: dict):
+    from src.bert import SentimentEngine
+    model_dir = build_tiny_model([a["body"] for a in articles])
+    return SentimentEngine(model_dir, batch_size=params["batch_size"], max_length=params["max_length"]), model_dir
+
+
+def run_classify(params: dict) -> dict:
+    articles, news_csv = _corpus_csv(params)
+    use_project(ANALYZER_DIR)
+    from src.sector import load_sector_dict, KeywordMatcher, classify_sector, classify_news_csv
+
+    keyword_csv = "src/11sector_keyword.csv"
+    matcher = KeywordMatcher(load_sector_dict(keyword_csv))
+    watch = Stopwatch()
+    for a in articles:
+        with watch.lap():
+            classify_sector(a["body"], matcher)
+
+    # 처리량은 파일 입출력을 포함한 classify_news_csv 기준
+    started = time.perf_counter()
+    classify_news_csv(news_csv, keyword_csv, os.path.join(WORK_DIR, "bench_sector.csv"),
+                      chunksize=params["chunksize"], workers=params["classify_workers"])
+    return summarize(watch.samples, len(articles), time.perf_counter() - started)
+
+
+def run_neardup(params: dict) -> dict:
+    articles, _ = _corpus_csv(params)
+    use_project(ANALYZER_DIR)
+    from src.neardup import NearDuplicateIndex
+
+    index = NearDuplicateIndex(threshold=params["near_dup_threshold"])
+    watch = Stopwatch()
+    duplicates = 0
+    for a in articles:
+        with watch.lap():
+            duplicates += index.add(a["id"], a["body"]) is not None
+    result = summarize(watch.samples, len(articles), watch.elapsed())
+    result["duplicates_found"] = duplicates
+    result["duplicates_planted"] = sum(a["dup_of"] is not None for a in articles)
+    return result
+
+
+def run_sentiment(params: dict) -> dict:
+    articles, news_csv = _corpus_csv(params)
+    use_project(ANALYZER_DIR)
+    from src.sector import classify_news_csv
+    from src.bert import run_bert_sentiment
+
+    engine, model_dir = _engine(articles, params)
+    sector_csv = os.path.join(WORK_DIR, "bench_sector.csv")
+    classify_news_csv(news_csv, "src/11sector_keyword.csv", sector_csv, chunksize=params["chunksize"])
+
+    # 배치 단위 지연 시간 (캐시 없이 모델 호출만)
+    texts = [a["body"] for a in articles]
+    bs = params["batch_size"]
+    watch = Stopwatch()
+    for i in range(0, len(texts), bs):
+        with watch.lap():
+            engine.predict(texts[i:i + bs])
+
+    started = time.perf_counter()
+    run_bert_sentiment(sector_csv, os.path.join(WORK_DIR, "bench_sentiment.csv"),
+                       os.path.join(WORK_DIR, "bench_statistic.csv"), engine=engine)
+    result = summarize(watch.samples, len(texts), time.perf_counter() - started)
+    result["model"] = model_info(model_dir)
+    return result
+
+
+def run_fused(params: dict) -> dict:
+    articles, news_csv = _corpus_csv(params)
+    use_project(ANALYZER_DIR)
+    from src.sector import load_sector_dict, KeywordMatcher
+    from src import pipeline
+
+    engine, model_dir = _engine(articles, params)
+    matcher = KeywordMatcher(load_sector_dict("src/11sector_keyword.csv"))
+
+    # 청크별 지연 시간 (분류 → 추론 → 기록 한 바퀴): 청크 시작 시각 간격으로 계산
+    chunk_starts = []
+    classify = pipeline.classify_news_df
+
+    def timed_classify(*args, **kwargs):
+        chunk_starts.append(time.perf_counter())
+        return classify(*args, **kwargs)
+
+    pipeline.classify_news_df = timed_classify
+    started = time.perf_counter()
+    pipeline.run_news_pipeline(news_csv, matcher, engine, os.path.join(WORK_DIR, "bench_fused_sentiment.csv"),
+                               os.path.join(WORK_DIR, "bench_fused_statistic.csv"), chunksize=params["chunksize"],
+                               near_dup_threshold=params["near_dup_threshold"])
+    wall = time.perf_counter() - started
+    marks = chunk_starts + [started + wall]
+    result = summarize([b - a for a, b in zip(marks, marks[1:])], len(articles), wall)
+    result["model"] = model_info(model_dir)
+    return result
+
+
+STAGES = {"classify": run_classify, "neardup": run_neardup, "sentiment": run_sentiment, "fused": run_fused}
+
+if __name__ == "__main__":
+    stage, params = sys.argv[1], json.loads(sys.argv[2])
+    try:
+        emit(stage, STAGES[stage](params))
+    except Exception as e:
+        emit(stage, error=f"{type(e).__name__}: {e}")
@@ -0,0 +1,81 @@
+import os
+import sys
+import json
+import time
+from collections import Counter
+
+from .common import CRAWLER_DIR, Stopwatch, summarize, emit, use_project
+from .corpus import make_corpus
+from .fake_naver import FakeNaver
+
+## 크롤러 스테이지 (run.py 가 스테이지마다 별도 프로세스로 실행)
+##   harvest : 로컬 API 페이징 + 언론사 페이지 스크래핑 전체 (기사당 scrape_full_body 지연 시간)
+##   extract : 네트워크 없이 기사 HTML 에서 본문 추출만 (기사당 CPU 시간)
+
+
+def run_harvest(params: dict) -> dict:
+    articles = make_corpus(params["articles"], seed=params["seed"], dup_rate=params["dup_rate"])
+    with FakeNaver(articles, hosts=params["hosts"], latency_ms=tuple(params["latency_ms"]),
+                   error_rate=params["error_rate"], bloat_kb=params["bloat_kb"], seed=params["seed"]) as fake:
+        # src.config 가 import 시점에 읽으므로 서버를 띄운 뒤, import 전에 설정
+        os.environ["NAVER_NEWS_URL"] = fake.api_url
+        os.environ.setdefault("NAVER_CLIENT_ID", "bench")
+        os.environ.setdefault("NAVER_CLIENT_SECRET", "bench")
+        use_project(CRAWLER_DIR)
+        from src import collector
+        from src.throttle import HostThrottle
+
+        # 기사별 스크래핑 지연 시간 계측 (collector 가 쓰는 이름을 감싸기만 함)
+        watch = Stopwatch()
+        scrape = collector.scrape_full_body
+
+        def timed_scrape(*args, **kwargs):
+            with watch.lap():
+                return scrape(*args, **kwargs)
+
+        collector.scrape_full_body = timed_scrape
+        interval = params["host_interval"]
+        throttle = HostThrottle((interval, interval), overrides={"127.0.0.1": (0.0, 0.0)})
+
+        extractors = Counter()
+        started = time.perf_counter()
+        for record in collector.harvest("벤치마크", max_items=params["articles"], sort="date", per_page=100,
+                                        workers=params["workers"], throttle=throttle):
+            extractors[record["extractor_used"]] += 1
+        wall = time.perf_counter() - started
+
+    result = summarize(watch.samples, sum(extractors.values()), wall)
+    result["extractors"] = dict(extractors)
+    result["server"] = dict(fake.stats)
+    return result
+
+
+def run_extract(params: dict) -> dict:
+    articles = make_corpus(params["articles"], seed=params["seed"], dup_rate=params["dup_rate"])
+    fake = FakeNaver(articles, hosts=params["hosts"], bloat_kb=params["bloat_kb"])
+    fake.publishers = [f"http://127.0.0.{k + 2}" for k in range(fake.hosts)]
+    pages = [(fake.article_url(a["id"]), *fake.render_page(a)) for a in articles]
+
+    use_project(CRAWLER_DIR)
+    from src.extract import extract_body
+
+    watch = Stopwatch()
+    extractors = Counter()
+    for url, body, content_type in pages:
+        with watch.lap():
+            _, extractor = extract_body(body, {"Content-Type": content_type}, url)
+        extractors[extractor] += 1
+    result = summarize(watch.samples, len(pages), watch.elapsed())
+    result["extractors"] = dict(extractors)
+    result["page_kb_avg"] = round(sum(len(b) for _, b, _ in pages) / len(pages) / 1024, 1)
+    return result
+
+
+STAGES = {"harvest": run_harvest, "extract": run_extract}
+
+if __name__ == "__main__":
+    stage, params = sys.argv[1], json.loads(sys.argv[2])
+    try:
+        emit(stage, STAGES[stage](params))
+    except Exception as e:
+        emit(stage, error=f"{type(e).__name__}: {e}")
@@ -0,0 +1,61 @@
+import os
+import json
+from typing import Dict, List
+
+from .common import WORK_DIR
+
+## 네트워크 없이 쓰는 스텁 감성 분류 모델
+## - 코퍼스 글자로 WordPiece vocab 을 만들고, 무작위 초기화한 작은 BERT 를 저장
+## - 예측 라벨은 의미가 없으며, 토크나이즈/배치/추론 경로의 처리 속도 측정용
+## - 라벨 이름은 snunlp/KR-FinBert-SC 와 같게 맞춤
+
+LABELS = {0: "negative", 1: "neutral", 2: "positive"}
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+
+def build_vocab(texts: List[str]) -> List[str]:
+    chars = sorted({c for t in texts for c in t if not c.isspace()})
+    return SPECIAL_TOKENS + chars + [f"##{c}" for c in chars]
+
+
+def build_tokenizer(vocab: List[str]):
+    """ BERT 규칙(정규화, 구두점 분리, WordPiece, [CLS]/[SEP])의 fast 토크나이저 """
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+    from transformers import PreTrainedTokenizerFast
+
+    ids = {tok: i for i, tok in enumerate(vocab)}
+    backend = Tokenizer(models.WordPiece(vocab=ids, unk_token="[UNK]"))
+    backend.normalizer = normalizers.BertNormalizer(lowercase=False, strip_accents=False)
+    backend.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    backend.post_processor = processors.BertProcessing(("[SEP]", ids["[SEP]"]), ("[CLS]", ids["[CLS]"]))
+    return PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]", pad_token="[PAD]",
+                                   cls_token="[CLS]", sep_token="[SEP]", mask_token="[MASK]")
+
+
+def build_tiny_model(texts: List[str], out_dir: str = os.path.join(WORK_DIR, "tiny_model"),
+                     hidden_size: int = 64, layers: int = 2, heads: int = 2, seed: int = 0) -> str:
+    """ 스텁 모델/토크나이저를 out_dir 에 저장하고 경로 반환 (이미 있으면 재사용) """
+    if os.path.exists(os.path.join(out_dir, "config.json")):
+        return out_dir
+
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification
+
+    os.makedirs(out_dir, exist_ok=True)
+    vocab = build_vocab(texts)
+    build_tokenizer(vocab).save_pretrained(out_dir)
+
+    torch.manual_seed(seed)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=hidden_size, num_hidden_layers=layers,
+        num_attention_heads=heads, intermediate_size=hidden_size * 4, max_position_embeddings=512,
+        num_labels=len(LABELS), id2label=LABELS, label2id={v: k for k, v in LABELS.items()},
+    )
+    BertForSequenceClassification(config).eval().save_pretrained(out_dir)
+    return out_dir
+
+
+def model_info(out_dir: str) -> Dict[str, int]:
+    with open(os.path.join(out_dir, "config.json"), encoding="utf-8") as f:
+        cfg = json.load(f)
+    return {k: cfg[k] for k in ("vocab_size", "hidden_size", "num_hidden_layers")}
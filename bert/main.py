@@ -1,33 +1,134 @@
 import os
 import glob
-from src.sector import classify_news_csv
-from src.bert import run_bert_sentiment
+from concurrent.futures import ThreadPoolExecutor
+from src.sector import classify_news_csv, load_sector_dict, KeywordMatcher
+from src.bert import run_bert_sentiment, get_engine
+from src.cache import SentimentCache
+from src.pipeline import run_news_pipeline
+from src.manifest import Manifest, file_sha256
+from src.stats_store import SentimentStatsStore
+from src.table_io import read_columns
+from src.metrics import registry, enable_profiling, dump_profiles
 
 if __name__ == "__main__":
     os.makedirs("out", exist_ok=True)
     
-    files = glob.glob("../naver_api_news_full_crawling/out/*.csv")
+    # 크롤러 출력 (같은 이름의 Parquet 이 있으면 CSV 대신 Parquet 을 읽음)
+    files = {}
+    for ext in ("csv", "parquet"):
+        for path in glob.glob(f"../naver_api_news_full_crawling/out/*.{ext}"):
+            if ext == "parquet":
+                try:
+                    read_columns(path)
+                except Exception as e:
+                    # 수집 중이거나 비정상 종료되어 footer 가 없는 Parquet 은 CSV 로 대신함
+                    print(f"[경고] Parquet 을 읽을 수 없어 건너뜀 ({e}) → {path}")
+                    continue
+            files[os.path.splitext(path)[0]] = path
     # 최신순 정렬
-    files_sorted = sorted(files, key=os.path.getctime, reverse=True)
+    files_sorted = sorted(files.values(), key=os.path.getctime, reverse=True)
+    # OUTPUT_FORMAT: 섹터 분류/감성 분석 결과 형식 ("parquet" 또는 "csv", 통계는 항상 csv)
+    OUTPUT_FORMAT = "csv"
+    # NEAR_DUP_THRESHOLD: 본문 유사도(MinHash 추정 Jaccard)가 이 값 이상인 근사 중복 기사는 대표 한 건만 분석 (None 이면 끔)
+    NEAR_DUP_THRESHOLD = 0.8
+    # SINCE_DATE: "YYYY-MM-DD" 이면 그 날짜 이후 기사만 분석 (Parquet 입력은 해당 row group 만 읽음)
+    SINCE_DATE = None
+    # PROFILE: True 이면 섹터 분류/감성 분석 함수를 cProfile 로 측정하여 out/profile/ 에 저장
+    PROFILE = False
+    enable_profiling(PROFILE)
 
     keyword_csv = "src/11sector_keyword.csv"
+    # 섹터 분류: 청크 단위 읽기/기록 크기와 키워드 매칭 프로세스 수 (대용량 CSV 용)
+    CLASSIFY_CHUNKSIZE = 5000
+    CLASSIFY_WORKERS = 1
+    # FUSED_PIPELINE: 뉴스 파일을 한 번만 읽어 섹터 분류 → 감성 분석 → 집계를 메모리 상에서 처리
+    # (False 이면 섹터 분류 CSV를 저장한 뒤 다시 읽는 기존 2단계 방식)
+    FUSED_PIPELINE = True
+    WRITE_SECTOR_CSV = False  # 통합 파이프라인에서도 *_sector_mapping.csv 를 남길지 여부
+    matcher = KeywordMatcher(load_sector_dict(keyword_csv))
 
-    for i, news_csv in enumerate(files_sorted, start=1):
-        print(f"\n[{i}/{len(files_sorted)}] 처리 중 → {news_csv}")
+    # 모델은 한 번만 로드하여 모든 파일에 재사용
+    # SENTIMENT_MODE: "truncate"(앞 512토큰) 또는 "chunk"(본문 전체를 겹치는 윈도우로 나누어 합산)
+    SENTIMENT_MODE = "truncate"
+    # SENTIMENT_WORKERS > 1 이면 워커 프로세스마다 모델을 올려 샤드 단위로 병렬 추론
+    SENTIMENT_WORKERS = 1
+    # SENTIMENT_BACKEND: "torch"(fp32), "torch_int8"(동적 양자화), "onnx"(ONNX Runtime)
+    # 변경 전 src.bert.compare_backends(샘플 본문, backend) 로 fp32 대비 라벨 일치율을 확인할 것
+    SENTIMENT_BACKEND = "torch"
+    engine = get_engine(batch_size=16, mode=SENTIMENT_MODE, stride=64, aggregate="mean",
+                        num_workers=SENTIMENT_WORKERS, backend=SENTIMENT_BACKEND,
+                        onnx_dir="cache/onnx_kr_finbert_sc")
+    # 본문 해시 기준 추론 결과 캐시 (파일 간 중복 기사 재추론 방지)
+    cache = SentimentCache("cache/sentiment_cache.sqlite")
+
+    # 매니페스트: 입력 내용/모델/키워드 사전이 그대로이고 출력이 남아 있는 파일은 건너뜀
+    manifest = Manifest("out/manifest.json")
+    version = {
+        "model": engine.cache_key,
+        "keywords": file_sha256(keyword_csv),
+        "pipeline": "fused" if FUSED_PIPELINE else "two_step",
+        "output_format": OUTPUT_FORMAT,
+        "since": SINCE_DATE or "",
+        "near_dup": str(NEAR_DUP_THRESHOLD or ""),
+    }
+    # 파일 간 누적 섹터 감성 통계 (파일별 기여분을 교체 방식으로 누적)
+    stats_store = SentimentStatsStore("out/sector_sentiment_store.sqlite")
+    # 동시에 처리할 파일 수 (엔진/캐시는 공유)
+    FILE_WORKERS = 1
 
+    def process_file(i: int, news_csv: str):
         base_name = os.path.splitext(os.path.basename(news_csv))[0]
-        output_sector_csv = f"out/{base_name}_sector_mapping.csv"
-        output_sentiment_csv = f"out/{base_name}_sentiment.csv"
+        content_hash = manifest.content_hash(news_csv)
+        if manifest.is_current(news_csv, content_hash, version):
+            print(f"[{i}/{len(files_sorted)}] 변경 없음, 건너뜀 → {news_csv}")
+            return
+
+        print(f"\n[{i}/{len(files_sorted)}] 처리 중 → {news_csv}")
+        output_sector_csv = f"out/{base_name}_sector_mapping.{OUTPUT_FORMAT}"
+        output_sentiment_csv = f"out/{base_name}_sentiment.{OUTPUT_FORMAT}"
         output_stat_csv = f"out/{base_name}_statistic.csv"
 
-        # 뉴스 섹터 분류
-        classify_news_csv(news_csv, keyword_csv, output_sector_csv)
+        if FUSED_PIPELINE:
+            # 섹터 분류 + 감성 분석 + 집계 (중간 CSV 없이)
+            sums_df = run_news_pipeline(news_csv, matcher, engine, output_sentiment_csv, output_stat_csv,
+                              output_sector_csv=output_sector_csv if WRITE_SECTOR_CSV else None,
+                              cache=cache, chunksize=CLASSIFY_CHUNKSIZE, since=SINCE_DATE,
+                              near_dup_threshold=NEAR_DUP_THRESHOLD)
+        else:
+            # 뉴스 섹터 분류
+            classify_news_csv(news_csv, keyword_csv, output_sector_csv,
+                              chunksize=CLASSIFY_CHUNKSIZE, workers=CLASSIFY_WORKERS, since=SINCE_DATE)
 
-        # 감성 분석, 집계
-        run_bert_sentiment(output_sector_csv, output_sentiment_csv, output_stat_csv)
+            # 감성 분석, 집계
+            sums_df = run_bert_sentiment(output_sector_csv, output_sentiment_csv, output_stat_csv,
+                                         engine=engine, cache=cache, near_dup_threshold=NEAR_DUP_THRESHOLD)
 
+        stats_store.update(sums_df, source=news_csv)
+
+        outputs = [output_sentiment_csv, output_stat_csv]
+        if not FUSED_PIPELINE or WRITE_SECTOR_CSV:
+            outputs.append(output_sector_csv)
+        manifest.record(news_csv, content_hash, version, outputs)
         print(f"완료: {base_name}")
 
+    with ThreadPoolExecutor(max_workers=FILE_WORKERS) as pool:
+        # result() 로 각 파일의 예외를 그대로 전달
+        for fut in [pool.submit(process_file, i, f) for i, f in enumerate(files_sorted, start=1)]:
+            fut.result()
+
+    # 전체 파일 기준 일별 섹터 감성 통계
+    stats_store.to_wide().to_csv("out/sector_sentiment_statistic_all.csv", index=False, encoding="utf-8-sig")
+    print("[전체 집계 완료] out/sector_sentiment_statistic_all.csv")
+
+    # 실행 메트릭 (분류 처리량, 추론 배치 지연, 초당 토큰 수, 패딩 비율)
+    registry.dump("out/metrics.json")
+    registry.dump("out/metrics.prom")
+    print("[메트릭 저장] out/metrics.json / out/metrics.prom")
+    if PROFILE:
+        print(f"[프로파일 저장] {', '.join(dump_profiles('out/profile'))}")
+
+    stats_store.close()
+    cache.close()
     print("\n[모든 파일 처리 완료]")
 
 
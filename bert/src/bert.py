@@ -1,28 +1,384 @@
+import os
+import math
+import shutil
+import tempfile
+import threading
+import time
 import pandas as pd
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
+import torch
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
+from .cache import SentimentCache, text_key
+from .table_io import read_columns, read_table, write_table
+from .neardup import TAG_COLUMNS, collapse_near_duplicates
+from .metrics import registry, profiled
+from .stats import summarize_scores, statistics_from_sums, aggregate_statistics  # 기존 src.bert 경로로도 사용 가능
 
-def run_bert_sentiment(input_csv: str, output_csv_sentiment: str, output_csv_stat: str):
-    df = pd.read_csv(input_csv)
+MODEL_NAME = "snunlp/KR-FinBert-SC"
+BACKENDS = ("torch", "torch_int8", "onnx")
+
+
+def _ort_model_class():
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise ImportError("backend='onnx' 사용 시 optimum[onnxruntime] 설치가 필요합니다") from e
+    return ORTModelForSequenceClassification
+
+
+def _export_onnx(model_name: str, onnx_dir: str):
+    """ onnx_dir 에 변환 결과가 없으면 한 번 변환하여 저장하고 변환한 모델을 반환 (이미 있으면 None)
+
+    임시 디렉터리에 저장한 뒤 교체하므로 저장 도중 중단되어도 불완전한 onnx_dir 이 남지 않는다.
+    """
+    if os.path.isdir(onnx_dir):
+        return None
+    model = _ort_model_class().from_pretrained(model_name, export=True)
+    tmp = f"{onnx_dir}.tmp-{os.getpid()}"
+    model.save_pretrained(tmp)
+    try:
+        os.replace(tmp, onnx_dir)
+    except OSError:
+        # 다른 프로세스가 먼저 저장한 경우 그 결과를 사용
+        shutil.rmtree(tmp, ignore_errors=True)
+    return model
+
+
+def _load_model(model_name: str, backend: str, onnx_dir: Optional[str] = None):
+    """ backend 에 맞는 분류 모델 로드 (모두 model(**enc).logits 인터페이스를 따름) """
+    if backend == "onnx":
+        if not onnx_dir:
+            return _ort_model_class().from_pretrained(model_name, export=True)
+        return _export_onnx(model_name, onnx_dir) or _ort_model_class().from_pretrained(onnx_dir)
 
-    model_name = "snunlp/KR-FinBert-SC"
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
     model = AutoModelForSequenceClassification.from_pretrained(model_name)
-    nlp = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+    model.eval()
+    if backend == "torch_int8":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+class SentimentEngine:
+    """ 모델을 프로세스당 한 번만 로드하여 여러 파일에 재사용하는 감성 분석 엔진
+
+    predict 는 텍스트를 길이순으로 정렬해 비슷한 길이끼리 배치를 구성하므로
+    패딩 토큰이 최소화되며, 결과는 입력 순서대로 반환된다.
+    cache 를 넘기면 동일 본문(정규화 기준)은 모델에 보내지 않고 캐시 결과를 사용한다.
+
+    mode="truncate": 본문 앞 max_length 토큰만 사용 (기존 방식)
+    mode="chunk": 본문 전체를 stride 만큼 겹치는 max_length 토큰 윈도우로 나누고,
+        여러 기사의 윈도우를 한 배치에 채워 추론한 뒤 aggregate 규칙으로 기사별 결과를 합친다.
+        aggregate: "mean"(윈도우 확률 평균), "max"(가장 확신도가 높은 윈도우),
+                   "weighted"(윈도우 토큰 수로 가중 평균)
+
+    backend="torch": PyTorch fp32 (기본)
+    backend="torch_int8": Linear 레이어 동적 int8 양자화
+    backend="onnx": ONNX Runtime (optimum[onnxruntime] 필요, onnx_dir 에 변환 결과를 저장해 재사용)
+    fp32 대비 라벨 차이는 compare_backends 로 측정할 수 있다.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, batch_size: int = 16, max_length: int = 512,
+                 mode: str = "truncate", stride: int = 64, aggregate: str = "mean",
+                 backend: str = "torch", onnx_dir: Optional[str] = None):
+        self._configure(model_name, batch_size, max_length, mode, stride, aggregate, backend)
+        # fast tokenizer 는 스레드 안전하지 않으므로 (FILE_WORKERS > 1) 추론은 한 번에 한 스레드만 수행
+        self._infer_lock = threading.Lock()
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = _load_model(model_name, backend, onnx_dir)
+        self.id2label = self.model.config.id2label
+
+    def _configure(self, model_name: str, batch_size: int, max_length: int,
+                   mode: str, stride: int, aggregate: str, backend: str = "torch"):
+        if backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 backend: {backend}")
+        if mode not in ("truncate", "chunk"):
+            raise ValueError(f"지원하지 않는 mode: {mode}")
+        if aggregate not in ("mean", "max", "weighted"):
+            raise ValueError(f"지원하지 않는 aggregate: {aggregate}")
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.mode = mode
+        self.stride = stride
+        self.aggregate = aggregate
+        self.backend = backend
+
+    def _forward(self, enc) -> torch.Tensor:
+        """ 토큰화된 배치의 클래스 확률 (batch, num_labels)
+
+        실제 토큰 수 / 패딩 포함 슬롯 수 / 배치 소요 시간을 메트릭으로 기록한다.
+        """
+        start = time.perf_counter()
+        with torch.inference_mode():
+            probs = self.model(**enc).logits.softmax(dim=-1)
+        elapsed = time.perf_counter() - start
+
+        mask = enc["attention_mask"]
+        tokens, slots = int(mask.sum()), mask.numel()
+        registry.observe("bert_batch_seconds", elapsed)
+        registry.inc("bert_sequences_total", mask.shape[0])
+        registry.inc("bert_tokens_total", tokens)
+        registry.inc("bert_padded_slots_total", slots)
+        if elapsed > 0:
+            registry.set("bert_tokens_per_second", tokens / elapsed)
+        registry.set("bert_padding_ratio",
+                     1 - registry.value("bert_tokens_total") / registry.value("bert_padded_slots_total"))
+        return probs
+
+    def _infer_batch(self, texts: List[str]) -> Tuple[List[str], List[float]]:
+        """ 한 배치 추론 (배치 내 최장 길이까지만 패딩) """
+        enc = self.tokenizer(texts, truncation=True, max_length=self.max_length,
+                             padding=True, return_tensors="pt")
+        best_scores, best_ids = self._forward(enc).max(dim=-1)
+        return [self.id2label[int(i)] for i in best_ids], best_scores.tolist()
+
+    @property
+    def cache_key(self) -> str:
+        """ 캐시 키에 포함할 모델/추론 설정 식별자 (설정이 바뀌면 캐시도 분리됨) """
+        key = f"{self.model_name}|max_length={self.max_length}"
+        if self.backend != "torch":
+            key += f"|backend={self.backend}"
+        if self.mode == "chunk":
+            key += f"|chunk stride={self.stride} aggregate={self.aggregate}"
+        return key
+
+    def predict(self, texts: Sequence[str], batch_size: Optional[int] = None,
+                cache: Optional[SentimentCache] = None) -> Tuple[List[str], List[float]]:
+        """ 텍스트 목록의 (label, score) 를 입력 순서대로 반환
+
+        같은 본문은 한 번만 추론하며, cache 에 있는 본문은 추론하지 않는다.
+        """
+        keys = [text_key(t, self.cache_key) for t in texts]
+        results = cache.get_many(set(keys)) if cache else {}
+        todo = {}
+        for k, t in zip(keys, texts):
+            if k not in results and k not in todo:
+                todo[k] = t
+        print(f"[감성분석] 전체 {len(texts)}건 중 추론 대상 {len(todo)}건 (중복/캐시 제외)")
+
+        if todo:
+            todo_keys = list(todo)
+            labels, scores = self._predict_batches([todo[k] for k in todo_keys], batch_size)
+            fresh = {k: (label, score) for k, label, score in zip(todo_keys, labels, scores)}
+            if cache:
+                cache.put_many(fresh)
+            results.update(fresh)
+
+        return [results[k][0] for k in keys], [results[k][1] for k in keys]
+
+    def _predict_batches(self, texts: Sequence[str], batch_size: Optional[int] = None) -> Tuple[List[str], List[float]]:
+        """ 길이순 배치로 모델 추론하여 입력 순서대로 반환 (여러 스레드가 같은 엔진을 써도 차례로 실행) """
+        with self._infer_lock:
+            return self._predict_sorted(texts, batch_size or self.batch_size)
+
+    def _predict_sorted(self, texts: Sequence[str], batch_size: int) -> Tuple[List[str], List[float]]:
+        if self.mode == "chunk":
+            return self._predict_chunked(texts, batch_size)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        labels: List[str] = [""] * len(texts)
+        scores: List[float] = [0.0] * len(texts)
+        for i in range(0, len(order), batch_size):
+            idx = order[i:i+batch_size]
+            batch_labels, batch_scores = self._infer_batch([texts[j] for j in idx])
+            for j, label, score in zip(idx, batch_labels, batch_scores):
+                labels[j], scores[j] = label, score
+
+            print(f"[진행상황] {i + len(idx)}/{len(texts)} 개 감성분석 완료")
+        return labels, scores
+
+    def _windows(self, ids: List[int]) -> List[List[int]]:
+        """ 토큰 id 를 stride 만큼 겹치는 윈도우로 분할 (특수 토큰 자리 제외) """
+        size = self.max_length - self.tokenizer.num_special_tokens_to_add()
+        step = max(1, size - self.stride)
+        windows = []
+        for start in range(0, max(len(ids), 1), step):
+            windows.append(ids[start:start + size])
+            if start + size >= len(ids):
+                break
+        return windows
+
+    def _predict_chunked(self, texts: Sequence[str], batch_size: int) -> Tuple[List[str], List[float]]:
+        """ 모든 기사의 윈도우를 길이순으로 섞어 배치를 채운 뒤 기사별로 합산 """
+        token_ids = self.tokenizer(list(texts), add_special_tokens=False, verbose=False)["input_ids"]
+        windows: List[Tuple[int, List[int]]] = [
+            (owner, w) for owner, ids in enumerate(token_ids) for w in self._windows(ids)
+        ]
+        order = sorted(range(len(windows)), key=lambda i: len(windows[i][1]))
+
+        window_probs: List[Optional[torch.Tensor]] = [None] * len(windows)
+        for i in range(0, len(order), batch_size):
+            idx = order[i:i+batch_size]
+            enc = self.tokenizer.pad(
+                {"input_ids": [self.tokenizer.build_inputs_with_special_tokens(windows[j][1]) for j in idx]},
+                return_tensors="pt",
+            )
+            for j, p in zip(idx, self._forward(enc)):
+                window_probs[j] = p
+
+            print(f"[진행상황] 윈도우 {i + len(idx)}/{len(windows)} 개 감성분석 완료")
+
+        per_text: List[List[Tuple[torch.Tensor, int]]] = [[] for _ in texts]
+        for (owner, w), p in zip(windows, window_probs):
+            per_text[owner].append((p, len(w)))
+
+        labels, scores = [], []
+        for parts in per_text:
+            probs = torch.stack([p for p, _ in parts])
+            if self.aggregate == "max":
+                combined = probs[probs.max(dim=-1).values.argmax()]
+            elif self.aggregate == "weighted":
+                weights = torch.tensor([max(n, 1) for _, n in parts], dtype=probs.dtype)
+                combined = (probs * weights[:, None]).sum(dim=0) / weights.sum()
+            else:
+                combined = probs.mean(dim=0)
+            best = int(combined.argmax())
+            labels.append(self.id2label[best])
+            scores.append(float(combined[best]))
+        return labels, scores
+
+
+# --- 멀티 프로세스 샤딩 ---
+_worker_engine: Optional[SentimentEngine] = None
+
+def _init_worker(model_name: str, engine_kwargs: dict, num_threads: int):
+    """ 워커 프로세스 초기화: intra-op 스레드 수를 고정하고 모델을 한 번 로드 """
+    global _worker_engine
+    torch.set_num_threads(num_threads)
+    _worker_engine = SentimentEngine(model_name, **engine_kwargs)
+
+def _predict_shard(texts: List[str], batch_size: int) -> Tuple[List[str], List[float], dict]:
+    """ 샤드 추론 결과와 이 샤드에서 쌓인 워커 메트릭 (부모 registry 에 merge) """
+    registry.reset()
+    labels, scores = _worker_engine._predict_batches(texts, batch_size)
+    return labels, scores, registry.export_state()
+
+
+class ShardedSentimentEngine(SentimentEngine):
+    """ 워커 프로세스마다 모델 사본을 두고 텍스트를 샤드로 나누어 병렬 추론하는 엔진
+
+    부모 프로세스는 모델을 로드하지 않고 캐시 조회와 샤드 분배/병합만 담당한다.
+    워커 풀은 엔진이 살아 있는 동안 유지되므로 여러 파일에 재사용된다.
+    num_workers * threads_per_worker 가 물리 코어 수를 넘지 않도록 설정하는 것이 좋다.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, batch_size: int = 16, max_length: int = 512,
+                 mode: str = "truncate", stride: int = 64, aggregate: str = "mean",
+                 backend: str = "torch", onnx_dir: Optional[str] = None,
+                 num_workers: Optional[int] = None, threads_per_worker: int = 1):
+        self._configure(model_name, batch_size, max_length, mode, stride, aggregate, backend)
+        self.num_workers = num_workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+        if backend == "onnx":
+            # 워커마다 변환하지 않도록 부모에서 한 번 변환해 두고 워커는 불러오기만 함
+            onnx_dir = onnx_dir or os.path.join(tempfile.mkdtemp(prefix="onnx_"), "model")
+            _export_onnx(model_name, onnx_dir)
+        engine_kwargs = dict(batch_size=batch_size, max_length=max_length, mode=mode,
+                             stride=stride, aggregate=aggregate, backend=backend, onnx_dir=onnx_dir)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, engine_kwargs, threads_per_worker),
+        )
+
+    def _predict_batches(self, texts: Sequence[str], batch_size: Optional[int] = None) -> Tuple[List[str], List[float]]:
+        """ 길이순으로 정렬한 뒤 연속 구간을 샤드로 나누어 워커에 분배하고 입력 순서로 병합 """
+        batch_size = batch_size or self.batch_size
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        # 워커 간 부하 균형을 위해 워커 수보다 잘게 나누되, 샤드는 배치 크기의 배수로 유지
+        per_shard = math.ceil(len(order) / (self.num_workers * 4))
+        shard_size = max(batch_size, math.ceil(per_shard / batch_size) * batch_size)
+        shards = [order[i:i + shard_size] for i in range(0, len(order), shard_size)]
+
+        futures = [self._pool.submit(_predict_shard, [texts[j] for j in shard], batch_size) for shard in shards]
+        labels: List[str] = [""] * len(texts)
+        scores: List[float] = [0.0] * len(texts)
+        for shard, fut in zip(shards, futures):
+            shard_labels, shard_scores, shard_metrics = fut.result()
+            registry.merge(shard_metrics)
+            for j, label, score in zip(shard, shard_labels, shard_scores):
+                labels[j], scores[j] = label, score
+        total = registry.value("bert_padded_slots_total")
+        if total:
+            registry.set("bert_padding_ratio", 1 - registry.value("bert_tokens_total") / total)
+        return labels, scores
+
+    def close(self):
+        self._pool.shutdown()
+
+
+_engines: Dict[tuple, SentimentEngine] = {}
+
+# 엔진 생성 인자의 기본값 (SentimentEngine / ShardedSentimentEngine 시그니처와 같게 유지)
+_ENGINE_DEFAULTS = dict(batch_size=16, max_length=512, mode="truncate", stride=64, aggregate="mean",
+                        backend="torch", onnx_dir=None, threads_per_worker=1)
+
+
+def _engine_key(model_name: str, num_workers: int, **kwargs) -> tuple:
+    """ 엔진 재사용 키: 모델 이름 + 워커 수 + 기본값을 채운 생성 인자 전체 """
+    settings = {**_ENGINE_DEFAULTS, **kwargs}
+    return (model_name, num_workers) + tuple(sorted(settings.items()))
+
+def get_engine(model_name: str = MODEL_NAME, num_workers: int = 1, **kwargs) -> SentimentEngine:
+    """ 모델/생성 인자/워커 수가 같은 엔진을 프로세스 안에서 한 번만 생성하여 재사용
+
+    num_workers > 1 이면 멀티 프로세스 샤딩 엔진(ShardedSentimentEngine)을 만든다.
+    """
+    key = _engine_key(model_name, num_workers, **kwargs)
+    if key not in _engines:
+        if num_workers > 1:
+            _engines[key] = ShardedSentimentEngine(model_name, num_workers=num_workers, **kwargs)
+        else:
+            _engines[key] = SentimentEngine(model_name, **kwargs)
+    return _engines[key]
+
+
+def compare_backends(texts: Sequence[str], backend: str, baseline: str = "torch",
+                     model_name: str = MODEL_NAME, **kwargs) -> dict:
+    """ 같은 샘플에 대해 baseline(fp32) 과 backend 의 라벨 일치율 / 점수 차이 / 소요 시간 비교
+
+    반환: {"n", "label_agreement", "mean_abs_score_diff", "baseline_sec", "backend_sec"}
+    """
+    texts = list(texts)
+    elapsed, outputs = {}, {}
+    for name in (baseline, backend):
+        engine = SentimentEngine(model_name, backend=name, **kwargs)
+        t0 = time.perf_counter()
+        outputs[name] = engine._predict_batches(texts)
+        elapsed[name] = time.perf_counter() - t0
+
+    base_labels, base_scores = outputs[baseline]
+    labels, scores = outputs[backend]
+    n = len(texts)
+    report = {
+        "n": n,
+        "label_agreement": sum(a == b for a, b in zip(base_labels, labels)) / n if n else 1.0,
+        "mean_abs_score_diff": sum(abs(a - b) for a, b in zip(base_scores, scores)) / n if n else 0.0,
+        "baseline_sec": round(elapsed[baseline], 3),
+        "backend_sec": round(elapsed[backend], 3),
+    }
+    print(f"[백엔드 비교] {baseline} vs {backend}: {report}")
+    return report
+
+
+@profiled("score_sentiment")
+def score_sentiment(df: pd.DataFrame, engine: Optional[SentimentEngine] = None,
+                    cache: Optional[SentimentCache] = None) -> pd.DataFrame:
+    """ 섹터 분류된 DataFrame 에 감성 라벨/점수와 date 를 붙여 [date, body_full, 섹터, label, score] 반환
+
+    입력에 cluster_size(근사 중복 묶음 크기)가 있으면 마지막 컬럼으로 함께 반환한다.
+    """
+    engine = engine or get_engine()
+    df = df.copy()
 
     # body_full 결측치 제거
     df["body_full"] = df["body_full"].fillna("").astype(str)
 
-    # 배치 처리
-    batch_size = 16
-    labels, scores = [], []
-    for i in range(0, len(df), batch_size):
-        batch_texts = df["body_full"].iloc[i:i+batch_size].tolist()
-        batch_results = nlp(batch_texts, truncation=True, max_length=512)
-        labels.extend([r["label"] for r in batch_results])
-        scores.extend([r["score"] for r in batch_results])
-
-        print(f"[진행상황] {i + len(batch_results)}/{len(df)} 개 감성분석 완료")
+    # 길이순 배치 처리 (캐시에 있는 본문은 추론 생략)
+    labels, scores = engine.predict(df["body_full"].tolist(), cache=cache)
 
     df["label"] = labels
     df["score"] = scores
@@ -35,37 +391,37 @@ def run_bert_sentiment(input_csv: str, output_csv_sentiment: str, output_csv_sta
     else:
         raise ValueError("date가 존재하지 않음")
 
-    final_df = df[["date", "body_full", "섹터", "label", "score"]]
-    final_df.to_csv(output_csv_sentiment, index=False, encoding="utf-8-sig")
+    columns = ["date", "body_full", "섹터", "label", "score"]
+    if "cluster_size" in df.columns:
+        columns.append("cluster_size")
+    return df[columns]
+
+
+def run_bert_sentiment(input_csv: str, output_csv_sentiment: str, output_csv_stat: str,
+                       engine: Optional[SentimentEngine] = None,
+                       cache: Optional[SentimentCache] = None,
+                       near_dup_threshold: Optional[float] = None,
+                       backend: str = "torch") -> pd.DataFrame:
+    """ 섹터 분류 결과(CSV/Parquet)를 감성 분석하여 저장하고, 통계 저장소용 점수 합계/건수를 반환
+
+    입출력 형식은 경로 확장자(.parquet / .csv)로 결정된다.
+    engine 을 넘기지 않으면 backend 설정의 공유 엔진(get_engine)을 사용한다.
+    near_dup_threshold 를 지정하면 본문 유사도가 그 이상인 근사 중복 기사는 대표 한 건만 분석하고
+    cluster_size 컬럼에 묶인 기사 수를 남긴다 (통계에서도 한 건으로 집계).
+    크롤러가 남긴 near_dup_of 표시가 있으면 본문 비교 없이 그 표시로 묶는다.
+    """
+    tags = [c for c in TAG_COLUMNS if c in read_columns(input_csv)]
+    df = read_table(input_csv, columns=["body_full", "published_at_kst", "섹터"] + tags)
+    if near_dup_threshold:
+        df = collapse_near_duplicates(df, threshold=near_dup_threshold)
+
+    final_df = score_sentiment(df, engine or get_engine(backend=backend), cache)
+    write_table(final_df, output_csv_sentiment)
     print(f"[감성분석 완료] {output_csv_sentiment}")
 
     # 집계
-    agg_df = final_df.groupby(["date", "섹터", "label"])["score"].mean().reset_index()
-    score_wide = agg_df.pivot_table(
-        index=["date", "섹터"],
-        columns="label",
-        values="score",
-        aggfunc="mean"
-    ).reset_index().rename_axis(None, axis=1)
-
-    count_df = (
-        final_df.groupby(["date", "섹터", "label"])["body_full"]
-        .count()
-        .reset_index(name="count")
-    )
-    total_df = count_df.groupby(["date", "섹터"])["count"].sum().reset_index(name="total")
-    count_df = count_df.merge(total_df, on=["date", "섹터"])
-    count_df["percent"] = (count_df["count"] / count_df["total"] * 100).round(2)
-
-    percent_wide = count_df.pivot_table(
-        index=["date", "섹터"],
-        columns="label",
-        values="percent",
-        aggfunc="mean"
-    ).reset_index().rename_axis(None, axis=1)
-
-    final_out = score_wide.merge(
-        percent_wide, on=["date", "섹터"], suffixes=("_score", "_percent")
-    )
-    final_out.to_csv(output_csv_stat, index=False, encoding="utf-8-sig")
-    print(f"[집계 완료] {output_csv_stat}")
\ No newline at end of file
+    sums_df = summarize_scores(final_df)
+    final_out = statistics_from_sums(sums_df)
+    write_table(final_out, output_csv_stat)
+    print(f"[집계 완료] {output_csv_stat}")
+    return sums_df
@@ -0,0 +1,65 @@
+import re
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """ 캐시 키용 본문 정규화 (NFC, 공백 축약, 앞뒤 공백 제거) """
+    return _WS.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def text_key(text: str, model_key: str) -> str:
+    """ 모델 식별자 + 정규화 본문의 SHA-256 해시 """
+    raw = f"{model_key}\0{normalize_text(text)}".encode("utf-8", errors="ignore")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class SentimentCache:
+    """ (모델, 본문 해시) → (label, score) 를 저장하는 SQLite 기반 영구 캐시 """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS sentiment_cache (
+                key TEXT PRIMARY KEY,
+                label TEXT NOT NULL,
+                score REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[str, float]]:
+        """ 캐시에 있는 키만 {key: (label, score)} 로 반환 """
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i+500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, label, score FROM sentiment_cache WHERE key IN ({marks})", chunk
+                ).fetchall()
+                found.update({k: (label, score) for k, label, score in rows})
+        return found
+
+    def put_many(self, items: Dict[str, Tuple[str, float]]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?)",
+                [(k, label, score) for k, (label, score) in items.items()],
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,81 @@
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+
+# 파일 내용 SHA-256 (대용량 파일도 일정한 메모리로 계산)
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class Manifest:
+    """ 입력 파일별 처리 이력(내용 해시, 모델/키워드 버전, 출력 경로)을 기록하는 JSON 매니페스트
+
+    입력 내용과 버전이 같고 출력 파일이 모두 남아 있으면 재처리할 필요가 없다.
+    입력 파일의 크기와 수정 시각이 기록과 같으면 내용 해시를 다시 계산하지 않는다.
+    여러 스레드에서 동시에 기록해도 안전하며, 저장은 임시 파일 교체 방식으로 원자적으로 수행한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, dict] = {}
+        self._stats: Dict[str, Tuple[int, int]] = {}  # content_hash 계산 시점의 (크기, 수정 시각)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("files", {})
+
+    @staticmethod
+    def _key(input_path: str) -> str:
+        return os.path.abspath(input_path)
+
+    def content_hash(self, input_path: str) -> str:
+        """ 입력 파일의 SHA-256 (크기/수정 시각이 기록과 같으면 기록된 해시를 그대로 사용) """
+        key = self._key(input_path)
+        st = os.stat(input_path)
+        stat = (st.st_size, st.st_mtime_ns)
+        entry = self.entries.get(key)
+        if entry and (entry.get("size"), entry.get("mtime_ns")) == stat:
+            content_hash = entry["sha256"]
+        else:
+            content_hash = file_sha256(input_path)
+        with self._lock:
+            self._stats[key] = stat
+        return content_hash
+
+    def is_current(self, input_path: str, content_hash: str, version: Dict[str, str]) -> bool:
+        entry = self.entries.get(self._key(input_path))
+        return bool(
+            entry
+            and entry["sha256"] == content_hash
+            and entry["version"] == version
+            and all(os.path.exists(p) for p in entry["outputs"])
+        )
+
+    def record(self, input_path: str, content_hash: str, version: Dict[str, str], outputs: List[str]):
+        key = self._key(input_path)
+        with self._lock:
+            size, mtime_ns = self._stats.pop(key, (None, None))
+            self.entries[key] = {
+                "sha256": content_hash,
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "version": version,
+                "outputs": outputs,
+                "processed_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save()
+
+    def _save(self):
+        tmp = f"{self.path}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"files": self.entries}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
@@ -0,0 +1,142 @@
+import re
+import zlib
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+## 근사 중복 기사 탐지 (MinHash + LSH)
+## - 본문을 문자 5-gram 으로 쪼개 MinHash 서명을 만들고, 서명을 band 로 나눈 버킷에서 후보만 비교
+## - 통신사 기사가 제목/URL 만 바뀌어 여러 번 실리는 경우를 한 기사로 묶음 (전체 쌍 비교 없이 O(n))
+## - shingles / NearDuplicateIndex 는 naver_api_news_full_crawling/src/neardup.py 와 같은 코드의 복사본: 크롤러와
+##   분석기는 각 폴더에서 따로 설치·실행되어 공유 패키지가 없으므로 의도적으로 나눠 둠 (양쪽을 함께 수정)
+
+_WS = re.compile(r"\s+")
+_PRIME = (1 << 31) - 1  # 해시 순열용 메르센 소수 (곱셈이 uint64 범위를 넘지 않음)
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """ 공백을 정리한 본문의 문자 n-gram 집합 (n 보다 짧으면 빈 집합) """
+    text = _WS.sub(" ", str(text)).strip()
+    if len(text) < size:
+        return set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class NearDuplicateIndex:
+    """ MinHash 서명 + LSH 버킷으로 대표 기사를 관리하는 근사 중복 인덱스
+
+    add 는 처음 보는 기사를 대표로 등록하고, 기존 대표와 추정 Jaccard 유사도가 threshold 이상이면
+    그 대표의 키를 반환한다. 대표 기사의 서명만 보관하며, 새 기사는 같은 버킷에 든 후보하고만 비교한다.
+    기본값(64 순열, 16 band × 4 row)에서 유사도 0.5 부근부터 후보로 잡힌다.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 의 배수여야 합니다")
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)[:, None]
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)[:, None]
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._sigs: Dict[Hashable, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[Hashable]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._sigs)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """ MinHash 서명 (uint32 × num_perm, 너무 짧은 본문은 None) """
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return None
+        h = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        return ((self._a * (h % _PRIME) + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray):
+        r = self.rows
+        return [(i, sig[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def find(self, sig: np.ndarray) -> Optional[Hashable]:
+        """ 같은 버킷 후보 중 유사도가 threshold 이상이면서 가장 높은 대표의 키 """
+        best, best_sim, checked = None, 0.0, set()
+        for band in self._band_keys(sig):
+            for key in self._buckets.get(band, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                sim = float(np.mean(self._sigs[key] == sig))
+                if sim >= self.threshold and sim > best_sim:
+                    best, best_sim = key, sim
+        return best
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """ 근사 중복이면 대표 기사의 키를, 아니면 key 를 대표로 등록하고 None 반환 """
+        sig = self.signature(text)
+        if sig is None:
+            return None
+        dup = self.find(sig)
+        if dup is not None:
+            return dup
+        self._sigs[key] = sig
+        for band in self._band_keys(sig):
+            self._buckets[band].append(key)
+        return None
+
+
+def near_duplicate_clusters(texts: Iterable[str], **index_kwargs) -> np.ndarray:
+    """ 각 본문이 속한 클러스터의 대표(처음 등장한 본문) 위치 배열 (texts 는 스트리밍으로 소비) """
+    index = NearDuplicateIndex(**index_kwargs)
+    canonical = []
+    for i, text in enumerate(texts):
+        dup = index.add(i, text)
+        canonical.append(i if dup is None else dup)
+    return np.asarray(canonical, dtype=np.int64)
+
+
+# 크롤러가 근사 중복을 표시해 둔 컬럼 (기사 키, 대표 기사의 키)
+TAG_COLUMNS = ("response_hash", "near_dup_of")
+
+
+def clusters_from_tags(keys: Iterable[str], near_dup_of: Iterable[str]) -> np.ndarray:
+    """ 크롤러가 남긴 near_dup_of(대표 기사의 response_hash)로 대표 위치 배열 구성
+
+    대표 기사가 입력에 없으면(날짜 필터 등으로 제외) 같은 대표를 가리키는 기사 중 처음 나온 기사가 대표가 된다.
+    """
+    pos = {}
+    canonical = []
+    for i, (key, rep) in enumerate(zip(keys, near_dup_of)):
+        rep = rep if isinstance(rep, str) and rep else key
+        if rep in pos:
+            canonical.append(pos[rep])
+        else:
+            canonical.append(i)
+            pos[rep] = i
+            pos.setdefault(key, i)
+    return np.asarray(canonical, dtype=np.int64)
+
+
+def has_tags(columns: Iterable[str]) -> bool:
+    return set(TAG_COLUMNS) <= set(columns)
+
+
+def collapse_near_duplicates(df: pd.DataFrame, column: str = "body_full", **index_kwargs) -> pd.DataFrame:
+    """ 근사 중복 기사 중 대표 행만 남기고 cluster_size(묶인 기사 수) 컬럼을 붙여 반환
+
+    크롤러가 near_dup_of 를 남긴 입력은 그 표시로 묶고, 없으면 본문 MinHash 로 찾는다.
+    입력에 이미 cluster_size 가 있으면(앞 단계에서 묶인 경우) 그 값을 합산한다.
+    """
+    if has_tags(df.columns):
+        canonical = clusters_from_tags(df["response_hash"].fillna("").astype(str),
+                                       df["near_dup_of"].fillna("").astype(str))
+    else:
+        canonical = near_duplicate_clusters(df[column].fillna("").astype(str).tolist(), **index_kwargs)
+    weights = df["cluster_size"].to_numpy(dtype=float) if "cluster_size" in df.columns else None
+    sizes = np.bincount(canonical, weights=weights, minlength=len(df)).astype(int)
+    keep = canonical == np.arange(len(df))
+    out = df[keep].copy()
+    out["cluster_size"] = sizes[keep]
+    return out
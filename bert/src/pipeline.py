@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from .sector import KeywordMatcher, classify_news_df
+from .table_io import read_columns, iter_table, TableWriter, write_table
+from .neardup import TAG_COLUMNS, clusters_from_tags, has_tags, near_duplicate_clusters
+from .bert import SentimentEngine, SentimentCache, score_sentiment
+from .stats import summarize_scores, statistics_from_sums
+
+
+# 뉴스 파일 → 섹터 분류 → 감성 분석 → 집계를 중간 CSV 없이 한 번에 처리
+def run_news_pipeline(news_csv: str, matcher: KeywordMatcher, engine: SentimentEngine,
+                      output_sentiment_csv: str, output_stat_csv: str,
+                      output_sector_csv: Optional[str] = None,
+                      cache: Optional[SentimentCache] = None,
+                      chunksize: Optional[int] = None,
+                      since: Optional[str] = None,
+                      near_dup_threshold: Optional[float] = None) -> pd.DataFrame:
+    """ 뉴스 CSV/Parquet 을 한 번만 읽어 섹터 분류 결과를 바로 감성 분석 배치로 넘기는 스트리밍 파이프라인
+
+    chunksize 를 지정하면 청크 단위로 읽고 감성 분석 결과를 이어서 기록한다.
+    집계에는 청크별 (date, 섹터, label) 점수 합계/건수만 메모리에 남긴다.
+    output_sector_csv 를 지정한 경우에만 섹터 분류 중간 결과를 함께 저장한다.
+    반환값은 통계 저장소(SentimentStatsStore)에 누적할 수 있는 점수 합계/건수이다.
+    입출력 형식은 경로 확장자(.parquet / .csv)로 결정되며, Parquet 입력은 본문/발행일 컬럼만 읽고
+    since("YYYY-MM-DD") 이전 row group 은 읽지 않는다.
+    near_dup_threshold 를 지정하면 먼저 파일 전체의 근사 중복 묶음을 구하고,
+    대표 기사만 분류/추론하며 cluster_size 컬럼에 묶인 기사 수를 남긴다.
+    크롤러가 near_dup_of 를 남긴 입력은 키 컬럼만 먼저 읽어 묶고, 표시가 없는 입력은 본문을
+    MinHash 로 비교하느라 본문 컬럼을 한 번 더 읽는다 (한 번 읽기가 깨지므로 크롤러 표시를 권장).
+    """
+    columns = read_columns(news_csv)
+    usecols = [c for c in ("body_full", "published_at_kst") if c in columns]
+
+    canonical = None
+    if near_dup_threshold:
+        # since 로 거를 때는 발행일 컬럼도 읽어야 함 (CSV 는 읽은 뒤 같은 조건으로 거름)
+        dates = [c for c in ("published_at_kst",) if c in columns]
+        if has_tags(columns):
+            tagged = pd.concat(list(iter_table(news_csv, columns=list(TAG_COLUMNS) + dates,
+                                               chunksize=chunksize, since=since)), ignore_index=True)
+            canonical = clusters_from_tags(tagged["response_hash"].fillna("").astype(str),
+                                           tagged["near_dup_of"].fillna("").astype(str))
+        else:
+            texts = (t for chunk in iter_table(news_csv, columns=usecols, chunksize=chunksize, since=since)
+                     for t in chunk["body_full"].fillna("").astype(str))
+            canonical = near_duplicate_clusters(texts, threshold=near_dup_threshold)
+        sizes = np.bincount(canonical, minlength=len(canonical))
+        print(f"[근사 중복] {len(canonical)}건 → 대표 {int((sizes > 0).sum())}건")
+
+    chunks = iter_table(news_csv, columns=usecols, chunksize=chunksize, since=since)
+
+    sector_writer = TableWriter(output_sector_csv) if output_sector_csv else None
+    sentiment_writer = TableWriter(output_sentiment_csv)
+    stat_parts = []
+    offset = 0
+    for chunk in chunks:
+        if canonical is not None:
+            # 첫 번째 훑기와 같은 순서로 읽으므로 파일 내 행 위치로 대표 여부를 판정
+            pos = np.arange(offset, offset + len(chunk))
+            offset += len(chunk)
+            keep = canonical[pos] == pos
+            chunk = chunk[keep].copy()
+            chunk["cluster_size"] = sizes[pos[keep]]
+
+        sector_df = classify_news_df(chunk, matcher)
+        if sector_writer:
+            sector_writer.write(sector_df)
+
+        final_df = score_sentiment(sector_df, engine, cache)
+        sentiment_writer.write(final_df)
+        stat_parts.append(summarize_scores(final_df))
+
+    if sector_writer:
+        sector_writer.close()
+    sentiment_writer.close()
+    print(f"[감성분석 완료] {output_sentiment_csv}")
+
+    sums_df = pd.concat(stat_parts, ignore_index=True)
+    sums_df = sums_df.groupby(["date", "섹터", "label"])[["score_sum", "count"]].sum().reset_index()
+    final_out = statistics_from_sums(sums_df)
+    write_table(final_out, output_stat_csv)
+    print(f"[집계 완료] {output_stat_csv}")
+    return sums_df
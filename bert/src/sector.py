@@ -1,5 +1,13 @@
 import pandas as pd
 import re
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
+
+from .table_io import read_columns, iter_table, TableWriter
+from .metrics import registry, profiled
+from .neardup import TAG_COLUMNS
 
 ## 섹터 2차 분류
 
@@ -14,34 +22,166 @@ def load_sector_dict(keyword_csv_path: str) -> dict:
     return sector_dict
 
 
-# 문장-섹터 분류 (단순 키워드 매칭)
-def classify_sector(text: str, sector_dict: dict) -> str:
-    scores = {sector: 0 for sector in sector_dict.keys()}
-    for sector, keywords in sector_dict.items():
-        for kw in keywords:
-            if kw in str(text):
-                scores[sector] += 1
+# 트라이 → 정규식 변환 (공통 접두사를 묶어 한 번의 스캔으로 매칭)
+def _trie_regex(node: dict) -> str:
+    alts = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    # 키워드가 여기서 끝날 수도 있으면 나머지는 선택적 (greedy 이므로 가장 긴 키워드 우선)
+    return f"(?:{body})?" if "" in node else body
+
+
+# 섹터 키워드 다중 패턴 매처
+class KeywordMatcher:
+    """ 전체 키워드를 하나의 트라이 정규식으로 컴파일하여 본문을 한 번만 스캔하는 매처
+
+    각 위치에서 가장 긴 키워드를 찾고, 그 키워드의 접두사인 다른 키워드도 함께 매칭된 것으로
+    처리하므로 `kw in text` 를 키워드마다 반복한 결과와 같다.
+    """
+
+    def __init__(self, sector_dict: Dict[str, List[str]]):
+        self.sectors = list(sector_dict.keys())
+        # 키워드 → 섹터별 등장 횟수 (한 섹터에 같은 키워드가 여러 번 있으면 그만큼 가산)
+        self.weights: Dict[str, Counter] = {}
+        for sector, keywords in sector_dict.items():
+            for kw in keywords:
+                self.weights.setdefault(kw, Counter())[sector] += 1
+        # 빈 키워드는 항상 포함되는 것으로 취급 (`"" in text` 와 동일)
+        self.always = self.weights.pop("", Counter())
+
+        trie: dict = {}
+        for kw in self.weights:
+            node = trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        self.pattern = re.compile(f"(?=({_trie_regex(trie)}))") if self.weights else None
+        self.prefixes = {
+            kw: [kw[:i] for i in range(1, len(kw) + 1) if kw[:i] in self.weights] for kw in self.weights
+        }
+
+    def find_keywords(self, text: str) -> set:
+        """ 본문에 포함된 키워드 집합 """
+        found = set()
+        if self.pattern:
+            for longest in set(m.group(1) for m in self.pattern.finditer(text)):
+                found.update(self.prefixes[longest])
+        return found
+
+    def score(self, text: str) -> Dict[str, int]:
+        """ 섹터별 매칭 키워드 수 """
+        scores = {sector: 0 for sector in self.sectors}
+        for sector, n in self.always.items():
+            scores[sector] += n
+        for kw in self.find_keywords(text):
+            for sector, n in self.weights[kw].items():
+                scores[sector] += n
+        return scores
+
+
+# 문장-섹터 분류 (키워드 매칭, 동점이면 키워드 파일의 섹터 순서가 앞선 쪽)
+def classify_sector(text: str, sector_dict: Union[dict, KeywordMatcher]) -> str:
+    matcher = sector_dict if isinstance(sector_dict, KeywordMatcher) else KeywordMatcher(sector_dict)
+    scores = matcher.score(str(text))
     best_sector = max(scores, key=scores.get)
     return best_sector if scores[best_sector] > 0 else "분류불가"
 
 
-# 뉴스-섹터 분류
-def classify_news_csv(news_csv_path: str, keyword_csv_path: str, output_path: str):
-    news_df = pd.read_csv(news_csv_path)
-    sector_dict = load_sector_dict(keyword_csv_path)
+# 본문 유효성 검사 (한글/영문/숫자가 하나라도 있는 문자열) - 벡터화 버전
+def valid_text_mask(texts: pd.Series) -> pd.Series:
+    if not (pd.api.types.is_object_dtype(texts) or pd.api.types.is_string_dtype(texts)):
+        return pd.Series(False, index=texts.index)
+    return texts.str.contains(r"[가-힣a-zA-Z0-9]", regex=True, na=False).astype(bool)
+
+
+# --- 프로세스 풀 워커 (매처는 워커마다 한 번만 컴파일) ---
+_worker_matcher = None
+
+def _init_classify_worker(sector_dict: dict):
+    global _worker_matcher
+    _worker_matcher = KeywordMatcher(sector_dict)
 
+def _classify_texts(texts: List[str]) -> List[str]:
+    return [classify_sector(t, _worker_matcher) for t in texts]
+
+
+def _record_classify(rows: int, seconds: float):
+    """ 분류 처리량 메트릭 (누적 건수 / 누적 시간 / 누적 기준 초당 건수) """
+    registry.inc("classify_rows_total", rows)
+    registry.inc("classify_seconds_total", seconds)
+    total = registry.value("classify_seconds_total")
+    if total > 0:
+        registry.set("classify_rows_per_second", registry.value("classify_rows_total") / total)
+
+
+# 뉴스 DataFrame 섹터 분류 (메모리 상에서 처리)
+@profiled("classify_news_df")
+def classify_news_df(news_df: pd.DataFrame, matcher: KeywordMatcher) -> pd.DataFrame:
+    """ 유효 본문만 남기고 섹터를 붙여 [body_full, published_at_kst, 섹터] 반환 (cluster_size·근사 중복 표시가 있으면 유지) """
     if "body_full" not in news_df.columns:
         raise ValueError("body_full이 존재하지 않음")
+    start = time.perf_counter()
+    news_df = news_df[valid_text_mask(news_df["body_full"])].copy()
+    news_df["섹터"] = [classify_sector(t, matcher) for t in news_df["body_full"]]
+    _record_classify(len(news_df), time.perf_counter() - start)
+    columns = ["body_full", "published_at_kst", "섹터"]
+    columns += [c for c in ("cluster_size",) + TAG_COLUMNS if c in news_df.columns]
+    return news_df[columns]
+
+
+# 뉴스-섹터 분류
+def classify_news_csv(news_csv_path: str, keyword_csv_path: str, output_path: str,
+                      chunksize: Optional[int] = None, workers: int = 1, since: Optional[str] = None):
+    """ 뉴스 CSV/Parquet 의 본문을 섹터로 분류하여 저장 (출력 형식은 output_path 확장자로 결정)
+
+    chunksize 를 지정하면 CSV를 청크 단위로 읽고 청크가 끝날 때마다 결과를 이어서 기록하므로
+    파일 크기와 무관하게 메모리 사용량이 일정하다.
+    workers > 1 이면 청크별 섹터 매칭을 프로세스 풀에서 병렬로 수행한다 (기록 순서는 입력 순서).
+    since("YYYY-MM-DD")를 지정하면 그 날짜 이후 발행 기사만 읽는다 (Parquet 은 row group 단위로 생략).
+    """
+    sector_dict = load_sector_dict(keyword_csv_path)
+    columns = read_columns(news_csv_path)
+    if "body_full" not in columns:
+        raise ValueError("body_full이 존재하지 않음")
+
+    # 필요한 컬럼만 읽음 (크롤러의 근사 중복 표시는 감성 분석 단계에서 쓰도록 함께 넘김)
+    usecols = [c for c in ("body_full", "published_at_kst") + TAG_COLUMNS if c in columns]
+    chunks = iter_table(news_csv_path, columns=usecols, chunksize=chunksize, since=since)
+
+    writer = TableWriter(output_path)
+    write_chunk = writer.write
+
+    def prepare(chunk: pd.DataFrame) -> pd.DataFrame:
+        return chunk[valid_text_mask(chunk["body_full"])].copy()
+
+    def finish(chunk: pd.DataFrame, sectors: List[str]):
+        chunk["섹터"] = sectors
+        write_chunk(chunk[["body_full", "published_at_kst", "섹터"] + [c for c in TAG_COLUMNS if c in chunk.columns]])
+
+    if workers > 1:
+        # 풀 경로는 청크별 CPU 시간 대신 전체 경과 시간 기준으로 처리량 기록
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_classify_worker,
+                                 initargs=(sector_dict,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                chunk = prepare(chunk)
+                pending.append((chunk, pool.submit(_classify_texts, chunk["body_full"].tolist())))
+                # 앞선 청크부터 순서대로 기록하여 처리 중인 청크 수를 제한
+                while len(pending) > workers * 2:
+                    done_chunk, fut = pending.popleft()
+                    finish(done_chunk, fut.result())
+            while pending:
+                done_chunk, fut = pending.popleft()
+                finish(done_chunk, fut.result())
+        _record_classify(writer.rows, time.perf_counter() - start)
+    else:
+        matcher = KeywordMatcher(sector_dict)
+        for chunk in chunks:
+            write_chunk(classify_news_df(chunk, matcher))
 
-    def is_valid_text(text: str) -> bool:
-        if not isinstance(text, str):
-            return False
-        return bool(re.search(r"[가-힣a-zA-Z0-9]", text))
-
-    news_df = news_df[news_df["body_full"].apply(is_valid_text)].copy()
-    
-    news_df["섹터"] = news_df["body_full"].apply(lambda x: classify_sector(x, sector_dict))
-    result_df = news_df[["body_full", "published_at_kst", "섹터"]]
-    
-    result_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    if not writer.started:
+        write_chunk(pd.DataFrame(columns=["body_full", "published_at_kst", "섹터"]))
+    writer.close()
     print(f"[섹터 분류 완료] {output_path}")
@@ -0,0 +1,45 @@
+import pandas as pd
+
+## 섹터 감성 통계 집계 (모델 없이 pandas 만 사용)
+## - summarize_scores: 기사별 결과 → (date, 섹터, label) 점수 합계/건수 (청크·파일 간에 더해서 합칠 수 있음)
+## - statistics_from_sums: 합계/건수 → *_statistic.csv 형식의 wide 테이블
+
+
+def summarize_scores(final_df: pd.DataFrame) -> pd.DataFrame:
+    """ (date, 섹터, label) 별 점수 합계/건수 - 파일·청크 간에 더해서 합칠 수 있는 중간 집계 """
+    return (
+        final_df.groupby(["date", "섹터", "label"])["score"]
+        .agg(score_sum="sum", count="count")
+        .reset_index()
+    )
+
+
+def statistics_from_sums(sums_df: pd.DataFrame) -> pd.DataFrame:
+    """ 점수 합계/건수로부터 (date, 섹터) 별 라벨 평균 점수와 라벨 비율(%) wide 테이블 생성 """
+    sums_df = sums_df.groupby(["date", "섹터", "label"])[["score_sum", "count"]].sum().reset_index()
+    sums_df["score"] = sums_df["score_sum"] / sums_df["count"]
+    score_wide = sums_df.pivot_table(
+        index=["date", "섹터"],
+        columns="label",
+        values="score",
+        aggfunc="mean"
+    ).reset_index().rename_axis(None, axis=1)
+
+    total = sums_df.groupby(["date", "섹터"])["count"].transform("sum")
+    sums_df["percent"] = (sums_df["count"] / total * 100).round(2)
+
+    percent_wide = sums_df.pivot_table(
+        index=["date", "섹터"],
+        columns="label",
+        values="percent",
+        aggfunc="mean"
+    ).reset_index().rename_axis(None, axis=1)
+
+    return score_wide.merge(
+        percent_wide, on=["date", "섹터"], suffixes=("_score", "_percent")
+    )
+
+
+def aggregate_statistics(final_df: pd.DataFrame) -> pd.DataFrame:
+    """ (date, 섹터) 별 라벨 평균 점수와 라벨 비율(%) wide 테이블 """
+    return statistics_from_sums(summarize_scores(final_df))
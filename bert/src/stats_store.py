@@ -0,0 +1,85 @@
+import os
+import sqlite3
+import threading
+import pandas as pd
+from pathlib import Path
+from typing import Optional
+
+from .stats import statistics_from_sums
+
+
+def source_key(path: str) -> str:
+    """ 통계 기여분을 구분하는 키: 크롤링 결과 파일 이름(확장자, 수집 중 표시 _incomplete 제외)
+
+    같은 수집의 X_incomplete.parquet / X.parquet / X.csv 는 같은 키가 되어 서로의 기여분을 교체한다.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem[:-len("_incomplete")] if stem.endswith("_incomplete") else stem
+
+
+class SentimentStatsStore:
+    """ (source, date, 섹터, label) 별 점수 합계/건수를 누적하는 SQLite 기반 통계 저장소
+
+    update 는 새로 분석한 파일의 중간 집계만 반영하므로 O(새 행 수)이고,
+    source 는 source_key 로 정규화하며, 같은 키를 다시 넣으면 이전 기여분을 교체하므로
+    재처리하거나 수집 중이던 파일이 완료 파일로 바뀌어도 중복 집계되지 않는다.
+    to_wide 는 임의의 날짜 구간에 대해 *_statistic.csv 와 같은 형식의 wide 테이블을 만든다.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS sentiment_stats (
+                source TEXT NOT NULL,
+                date TEXT NOT NULL,
+                sector TEXT NOT NULL,
+                label TEXT NOT NULL,
+                score_sum REAL NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (source, date, sector, label)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_stats_date ON sentiment_stats(date)")
+        self._conn.commit()
+
+    def update(self, sums_df: pd.DataFrame, source: str):
+        """ summarize_scores 결과(date, 섹터, label, score_sum, count)를 source 의 기여분으로 반영 """
+        source = source_key(source)
+        rows = [
+            (source, str(r.date), str(r.섹터), str(r.label), float(r.score_sum), int(r.count))
+            for r in sums_df.itertuples(index=False)
+        ]
+        with self._lock:
+            # 같은 키의 이전 기여분 삭제 (예전 버전이 절대 경로로 저장한 source 포함)
+            stale = [(s,) for (s,) in self._conn.execute("SELECT DISTINCT source FROM sentiment_stats")
+                     if source_key(s) == source]
+            self._conn.executemany("DELETE FROM sentiment_stats WHERE source = ?", stale)
+            self._conn.executemany("INSERT INTO sentiment_stats VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def to_wide(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """ [start_date, end_date] (YYYY-MM-DD, 양 끝 포함) 구간의 섹터 감성 통계 wide 테이블 """
+        query = "SELECT date, sector, label, SUM(score_sum), SUM(count) FROM sentiment_stats"
+        conds, params = [], []
+        if start_date:
+            conds.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conds.append("date <= ?")
+            params.append(end_date)
+        if conds:
+            query += " WHERE " + " AND ".join(conds)
+        query += " GROUP BY date, sector, label"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        sums_df = pd.DataFrame(rows, columns=["date", "섹터", "label", "score_sum", "count"])
+        if sums_df.empty:
+            return pd.DataFrame(columns=["date", "섹터"])
+        return statistics_from_sums(sums_df)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,129 @@
+import os
+import pandas as pd
+from typing import Iterator, List, Optional
+
+## CSV / Parquet 공용 입출력
+## - Parquet 은 필요한 컬럼만 읽고(column projection) 날짜 조건을 row group 단위로 걸러냄(predicate pushdown)
+## - CSV 는 기존과 같이 utf-8-sig 로 기록
+
+
+def is_parquet(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+# 테이블 컬럼 목록 (데이터는 읽지 않음)
+def read_columns(path: str) -> List[str]:
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_table(path: str, columns: Optional[List[str]] = None, chunksize: Optional[int] = None,
+               since: Optional[str] = None, date_column: str = "published_at_kst") -> Iterator[pd.DataFrame]:
+    """ 테이블을 (청크 단위로) 읽어 DataFrame 으로 yield
+
+    columns: 읽을 컬럼 (None 이면 전체)
+    since: "YYYY-MM-DD" 이면 date_column 이 그 날짜 이후인 행만 반환
+           (published_at_kst 는 "YYYY-MM-DD HH:MM:SS+0900" 문자열이므로 문자열 비교로 충분)
+    """
+    if is_parquet(path):
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(path, format="parquet")
+        flt = ds.field(date_column) >= since if since else None
+        if chunksize:
+            empty = True
+            for batch in dataset.to_batches(columns=columns, filter=flt, batch_size=chunksize):
+                if batch.num_rows:
+                    empty = False
+                    yield batch.to_pandas()
+            if empty:
+                # 조건에 맞는 행이 없어도 컬럼 구성을 알 수 있도록 빈 청크 하나를 반환
+                yield dataset.to_table(columns=columns, filter=flt).to_pandas()
+        else:
+            yield dataset.to_table(columns=columns, filter=flt).to_pandas()
+        return
+
+    reader = pd.read_csv(path, usecols=columns, chunksize=chunksize) if chunksize else [pd.read_csv(path, usecols=columns)]
+    for chunk in reader:
+        if since:
+            # 발행일이 없는 행은 제외 (astype(str) 하면 "nan" 이 모든 날짜보다 뒤로 정렬됨)
+            dates = chunk[date_column]
+            chunk = chunk[dates.notna() & (dates.astype(str) >= since)]
+        yield chunk
+
+
+def read_table(path: str, columns: Optional[List[str]] = None, since: Optional[str] = None) -> pd.DataFrame:
+    return next(iter_table(path, columns=columns, since=since))
+
+
+def _arrow_schema(df: pd.DataFrame):
+    """ 첫 청크로 정한 Parquet 스키마 (값이 모두 비어 있는 컬럼은 float/null 대신 string 으로 고정) """
+    import pyarrow as pa
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    return pa.schema([pa.field(f.name, pa.string()) if pa.types.is_null(f.type) or df[f.name].isna().all() else f
+                      for f in schema])
+
+
+def _conform(df: pd.DataFrame, schema) -> pd.DataFrame:
+    """ string 으로 고정된 컬럼이 이후 청크에서 float(NaN) 등으로 읽힌 경우 문자열/None 으로 맞춤 """
+    import pyarrow as pa
+    cols = [f.name for f in schema if pa.types.is_string(f.type) and df[f.name].dtype != object]
+    if not cols:
+        return df
+    df = df.copy()
+    for col in cols:
+        values = df[col]
+        df[col] = values.astype(str).astype(object).where(values.notna(), None)
+    return df
+
+
+class TableWriter:
+    """ DataFrame 청크를 이어서 기록하는 writer (확장자가 .parquet 이면 Parquet, 아니면 CSV)
+
+    Parquet 스키마는 첫 비어 있지 않은 청크로 정하되, 그 청크에서 값이 모두 비어 있는 컬럼
+    (예: 근사 중복이 없는 구간의 near_dup_of)은 string 으로 고정하여 이후 청크의 문자열 값도 받는다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self.started = False
+        self._writer = None
+        self._schema = None
+        self._empty: Optional[pd.DataFrame] = None  # 빈 청크만 들어온 경우 close() 에서 기록
+
+    def write(self, df: pd.DataFrame):
+        if is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._writer is None:
+                if df.empty:
+                    # 빈 DataFrame 의 object 컬럼은 null 타입으로 추론되므로 스키마는 첫 비어 있지 않은 청크로 정함
+                    self._empty = df
+                    self.started = True
+                    return
+                self._schema = _arrow_schema(df)
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            df = _conform(df, self._schema)
+            self._writer.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+        else:
+            first = not self.started
+            df.to_csv(self.path, index=False, header=first, mode="w" if first else "a",
+                      encoding="utf-8-sig" if first else "utf-8")
+        self.started = True
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is None and self._empty is not None:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            pq.write_table(pa.Table.from_pandas(self._empty, preserve_index=False), self.path)
+        if self._writer:
+            self._writer.close()
+
+
+def write_table(df: pd.DataFrame, path: str):
+    writer = TableWriter(path)
+    writer.write(df)
+    writer.close()
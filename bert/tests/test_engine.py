@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src import bert
+
+@pytest.fixture
+def fake_engines(monkeypatch):
+    """ 모델을 올리지 않고 생성 인자만 기록하는 엔진으로 대체 """
+    class FakeEngine:
+        def __init__(self, model_name, **kwargs):
+            self.model_name, self.kwargs = model_name, kwargs
+
+    monkeypatch.setattr(bert, "_engines", {})
+    monkeypatch.setattr(bert, "SentimentEngine", FakeEngine)
+    monkeypatch.setattr(bert, "ShardedSentimentEngine", FakeEngine)
+    return FakeEngine
+
+def test_get_engine_reuses_same_settings(fake_engines):
+    assert bert.get_engine(batch_size=16) is bert.get_engine()
+    assert bert.get_engine(backend="torch_int8") is bert.get_engine(backend="torch_int8")
+
+@pytest.mark.parametrize("kwargs", [
+    dict(batch_size=64), dict(backend="onnx"), dict(onnx_dir="cache/onnx"), dict(mode="chunk"),
+    dict(num_workers=2), dict(num_workers=2, threads_per_worker=2),
+])
+def test_get_engine_separates_settings(fake_engines, kwargs):
+    engine = bert.get_engine(**kwargs)
+    assert engine is not bert.get_engine()
+    assert engine.kwargs.get("batch_size", 16) == kwargs.get("batch_size", 16)
+
+@pytest.fixture
+def fake_ort(monkeypatch):
+    """ 변환/불러오기 호출을 기록하는 ORTModelForSequenceClassification 대체 """
+    calls = []
+
+    class FakeORT:
+        @classmethod
+        def from_pretrained(cls, name, export=False):
+            calls.append(("export" if export else "load", name))
+            return cls()
+
+        def save_pretrained(self, path):
+            import os
+            os.makedirs(path)
+            open(os.path.join(path, "model.onnx"), "w").close()
+
+    monkeypatch.setattr(bert, "_ort_model_class", lambda: FakeORT)
+    return calls
+
+def test_onnx_export_happens_once(tmp_path, fake_ort):
+    onnx_dir = str(tmp_path / "onnx")
+    bert._load_model("m", "onnx", onnx_dir)
+    bert._load_model("m", "onnx", onnx_dir)
+
+    assert fake_ort == [("export", "m"), ("load", onnx_dir)]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["onnx"]
+
+def test_sharded_engine_exports_before_starting_workers(tmp_path, fake_ort, monkeypatch):
+    pools = []
+    monkeypatch.setattr(bert, "ProcessPoolExecutor", lambda **kwargs: pools.append(kwargs))
+    onnx_dir = str(tmp_path / "onnx")
+
+    bert.ShardedSentimentEngine("m", backend="onnx", onnx_dir=onnx_dir, num_workers=4)
+
+    assert fake_ort == [("export", "m")]
+    _, engine_kwargs, _ = pools[0]["initargs"]
+    assert engine_kwargs["onnx_dir"] == onnx_dir
@@ -0,0 +1,44 @@
+import sys
+
+import pandas as pd
+import pytest
+
+from src.stats_store import SentimentStatsStore, source_key
+
+def _sums(date: str, score: float, count: int, label: str = "positive"):
+    return pd.DataFrame({"date": [date], "섹터": ["IT"], "label": [label], "score_sum": [score], "count": [count]})
+
+@pytest.fixture
+def store(tmp_path):
+    store = SentimentStatsStore(str(tmp_path / "stats.sqlite"))
+    yield store
+    store.close()
+
+def test_store_does_not_load_model_stack():
+    assert "torch" not in sys.modules and "transformers" not in sys.modules
+
+@pytest.mark.parametrize("path", ["out/20261001_x.parquet", "/abs/out/20261001_x_incomplete.csv", "20261001_x"])
+def test_source_key_ignores_directory_extension_and_incomplete(path):
+    assert source_key(path) == "20261001_x"
+
+def test_incomplete_and_final_file_count_once(store):
+    store.update(_sums("2026-10-01", 0.9, 1), source="out/20261001_x_incomplete.parquet")
+    store.update(_sums("2026-10-01", 1.6, 2), source="out/20261001_x.parquet")
+
+    wide = store.to_wide()
+    assert wide["positive_percent"].tolist() == [100.0]
+    assert wide["positive_score"].tolist() == [pytest.approx(0.8)]
+
+def test_update_replaces_legacy_absolute_path_source(store):
+    store._conn.execute("INSERT INTO sentiment_stats VALUES ('/abs/out/20261001_x.csv', '2026-10-01', 'IT', 'negative', 0.7, 1)")
+    store._conn.commit()
+
+    store.update(_sums("2026-10-01", 0.9, 1), source="out/20261001_x.csv")
+
+    assert store._conn.execute("SELECT source, label FROM sentiment_stats").fetchall() == [("20261001_x", "positive")]
+
+def test_to_wide_filters_date_range(store):
+    store.update(_sums("2026-10-01", 0.9, 1), source="a.csv")
+    store.update(_sums("2026-10-05", 0.5, 1, label="negative"), source="b.csv")
+
+    assert store.to_wide("2026-10-02")["date"].tolist() == ["2026-10-05"]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.table_io import TableWriter, iter_table
+from src.sector import classify_news_csv
+
+def _chunk(start: int, n: int, near_dup_of):
+    return pd.DataFrame({
+        "body_full": [f"본문 {i}" for i in range(start, start + n)],
+        "published_at_kst": [f"2026-10-0{1 + i % 5} 10:00:00+0900" for i in range(start, start + n)],
+        "near_dup_of": near_dup_of,
+        "cluster_size": [1] * n,
+    })
+
+def test_parquet_writer_accepts_strings_after_all_null_chunk(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    writer = TableWriter(path)
+    writer.write(_chunk(0, 3, [np.nan] * 3))
+    writer.write(_chunk(3, 3, ["h1", np.nan, "h2"]))
+    writer.write(_chunk(6, 2, [np.nan] * 2))
+    writer.close()
+
+    table = pq.read_table(path)
+    assert table.num_rows == 8
+    assert str(table.schema.field("near_dup_of").type) == "string"
+    assert table.column("near_dup_of").to_pylist() == [None] * 3 + ["h1", None, "h2"] + [None] * 2
+    assert str(table.schema.field("cluster_size").type) == "int64"
+
+def test_parquet_writer_keeps_empty_first_chunk_schema(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    writer = TableWriter(path)
+    writer.write(_chunk(0, 0, []))
+    writer.write(_chunk(0, 4, ["", "h0", "", "h0"]))
+    writer.close()
+
+    assert pq.read_table(path).num_rows == 4
+
+def test_classify_chunks_of_crawler_csv_to_parquet(tmp_path):
+    news = pd.DataFrame({
+        "body_full": ["삼성전자 반도체 수출 증가 " * 5 + str(i) for i in range(20)],
+        "published_at_kst": ["2026-10-01 10:00:00+0900"] * 20,
+        "response_hash": [f"h{i}" for i in range(20)],
+        "near_dup_of": [""] * 10 + ["h1"] * 10,  # 첫 청크들은 모두 빈 값 → CSV 에서 NaN 으로 읽힘
+    })
+    news_csv = str(tmp_path / "news.csv")
+    news.to_csv(news_csv, index=False)
+    keywords = str(tmp_path / "keywords.csv")
+    pd.DataFrame({"섹터": ["IT"], "키워드": ["반도체"]}).to_csv(keywords, index=False)
+    out = str(tmp_path / "sector.parquet")
+
+    classify_news_csv(news_csv, keywords, out, chunksize=7)
+
+    result = next(iter_table(out))
+    assert len(result) == 20
+    assert result["near_dup_of"].fillna("").tolist() == [""] * 10 + ["h1"] * 10
@@ -1,89 +1,173 @@
-import csv
-from pathlib import Path
+import os
+import requests
+import pandas as pd
 from datetime import datetime, timedelta
 
 # src 폴더의 함수들을 가져옴
-from src.config import KST
-from src.collector import harvest
-from src.utils import dedupe
-
-def save_to_csv(records: list, path: str):
-    """ 수집된 데이터를 CSV 파일로 저장 """
-    if not records: return
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    fields = records[0].keys()
-    with open(path, "w", newline="", encoding="utf-8-sig") as f:
-        wr = csv.DictWriter(f, fieldnames=fields)
-        wr.writeheader()
-        wr.writerows(records)
-
-def save_to_parquet(records: list, path: str):
-    """ 수집된 데이터를 Parquet 파일로 저장 """
-    try:
-        import pandas as pd
-        Path(path).parent.mkdir(parents=True, exist_ok=True)
-        df = pd.DataFrame(records)
-        df.to_parquet(path, index=False)
-    except Exception as e:
-        print(f"[warn] Parquet 저장 실패: {e}")
+from src.config import KST, CACHE_PATH, SEEN_INDEX_PATH, CHECKPOINT_PATH
+from src.collector import harvest, harvest_many
+from src.cache import ScrapeCache
+from src.seen import SeenIndex
+from src.checkpoint import HarvestCheckpoint
+from src.sinks import CsvSink, ParquetSink, JsonlSink
+from src.utils import iter_dedupe
+from src.neardup import NearDuplicateIndex, iter_near_tag
+from src.metrics import registry, enable_profiling, dump_profiles
 
 def main():
     """ 메인 실행 함수 """
     # ---- 수집 설정 ----
-    QUERY = "부동산" ## 섹터 1차 분류
+    QUERIES = ["부동산"] ## 섹터 1차 분류 (여러 개면 검색어 간 중복 기사를 한 번만 스크래핑)
     MAX_ITEMS = 1000
     RECENT_DAYS_LIMIT = 30
     SORT_ORDER = "date" # 최신순(date) 또는 관련도순(sim)
+    INCREMENTAL = True  # 이전 실행에서 수집한 기사는 건너뛰고 새 기사만 저장
+    PARQUET_ROW_GROUP = 100  # Parquet row group 크기 (이 건수마다 디스크에 flush)
+    WRITE_JSONL = False      # True 이면 JSONL 파일도 함께 저장
+    PROFILE = False          # True 이면 API 호출/본문 추출 함수를 cProfile 로 측정하여 out/profile/ 에 저장
+    NEAR_DUP_THRESHOLD = 0.8 # 본문 유사도가 이 값 이상인 근사 중복(통신사 전재) 기사에 대표 기사의 response_hash 를 near_dup_of 로 표시 (None 이면 끔)
+    RESUME = True            # 같은 설정으로 중단된 수집의 체크포인트가 있으면 이어서 수집 (False 이면 항상 처음부터)
     
-    print(f"'{QUERY}' 키워드로 최신 기사 수집을 시작합니다 (최대 {MAX_ITEMS}건).")
+    print(f"{QUERIES} 키워드로 최신 기사 수집을 시작합니다 (검색어별 최대 {MAX_ITEMS}건).")
     
-    all_recs = []
+    timestamp = datetime.now(KST).strftime("%Y%m%d_%H%M%S")
+    safe_query = "_".join(
+        "".join(c for c in q if c.isalnum() or c in " ").strip().replace(" ", "_") for q in QUERIES
+    )
+    base_filename = f"out/{timestamp}_{safe_query}"
+
+    # 체크포인트: 페이징 커서와 처리한 기사를 주기적으로 기록 (완료되면 삭제)
+    checkpoint = HarvestCheckpoint(CHECKPOINT_PATH)
+    resumed = checkpoint.begin({"queries": QUERIES, "max_items": MAX_ITEMS, "sort": SORT_ORDER, "per_page": 100},
+                               resume=RESUME)
+    if resumed:
+        # 중단된 수집의 출력 파일에 이어서 기록 (중단 시 붙인 '_incomplete' 는 다시 제거)
+        base_filename = checkpoint.meta["base_filename"]
+        for ext in (".csv", ".parquet", ".jsonl"):
+            if os.path.exists(f"{base_filename}_incomplete{ext}"):
+                os.replace(f"{base_filename}_incomplete{ext}", f"{base_filename}{ext}")
+        print(f"체크포인트에서 이어서 수집합니다 (처리 완료 {checkpoint.done_count}건) → {base_filename}")
+    else:
+        checkpoint.meta["base_filename"] = base_filename
+        checkpoint.save()
+
+    # 레코드를 받는 즉시 기록하는 스트리밍 출력 (JSONL 은 WRITE_JSONL 로 선택)
+    # Parquet 은 row group 단위로만 기록되므로 강제 종료 후에는 매 레코드 flush 되는 CSV 로 복구
+    sinks = [CsvSink(f"{base_filename}.csv", append=resumed),
+             ParquetSink(f"{base_filename}.parquet", row_group_size=PARQUET_ROW_GROUP, append=resumed,
+                         source_csv=f"{base_filename}.csv")]
+    if WRITE_JSONL:
+        sinks.append(JsonlSink(f"{base_filename}.jsonl", append=resumed))
+
+    limit_date = datetime.now(KST) - timedelta(days=RECENT_DAYS_LIMIT) if RECENT_DAYS_LIMIT > 0 else None
+    if limit_date:
+        print(f"발행일 기준 최근 {RECENT_DAYS_LIMIT}일 이내 기사만 수집합니다.")
+
+    enable_profiling(PROFILE)
+    cache = ScrapeCache(CACHE_PATH)
+    seen_index = SeenIndex(SEEN_INDEX_PATH) if INCREMENTAL else None
+    collected = checkpoint.meta.get("collected", 0)  # harvest 가 반환한 건수 (중복 제거/필터링 전)
+    saved = 0           # 파일에 기록한 건수
+    saved_keys = []     # 증분 인덱스에 기록할 (response_hash, URL) 만 보관 (본문 추출에 실패한 기사는 다음 실행에서 재시도)
+    near_dups = 0       # near_dup_of 가 표시된 기사 수
+    near_index = NearDuplicateIndex(threshold=NEAR_DUP_THRESHOLD) if NEAR_DUP_THRESHOLD else None
+    saved_titles = set()  # 중복 제거 기준 (url, title)
+    if resumed and os.path.exists(f"{base_filename}.csv"):
+        # 중단 전에 저장한 기사로 중복 제거 / 근사 중복 인덱스와 증분 인덱스 기록 대상을 복원
+        # (처리 완료 기록은 주기적으로만 fsync 되므로 CSV 에는 있지만 다시 수집되는 기사가 있을 수 있음)
+        key_cols = ["response_hash", "originallink", "url"]
+        prior = pd.read_csv(f"{base_filename}.csv", usecols=key_cols + ["title", "body_full"],
+                            dtype=str, keep_default_na=False)
+        for row in prior.itertuples(index=False):
+            saved_titles.add((row.url, row.title))
+            if near_index is not None:
+                near_index.add(row.response_hash, row.body_full)
+            saved += 1
+            if row.body_full:
+                saved_keys.append({k: getattr(row, k) or None for k in key_cols})
+    # 검색어별 페이징 종료 사유 (체크포인트에 함께 저장되어 이어서 수집한 실행에도 남음)
+    stop_reasons = checkpoint.meta.setdefault("stop_reasons", {})
+    interrupted = False
     try:
         # 1. 데이터 수집 (KeyboardInterrupt를 감지하기 위해 list() 대신 for 루프 사용)
         print("수집을 중단하려면 Ctrl+C를 누르세요...")
-        for record in harvest(query=QUERY, max_items=MAX_ITEMS, sort=SORT_ORDER, per_page=100):
-            all_recs.append(record)
-            # 실시간 진행 상황을 보기 위한 출력 (10개마다)
-            if len(all_recs) % 10 == 0:
-                print(f"  현재까지 {len(all_recs)}건 수집됨...")
+        if len(QUERIES) == 1:
+            records = harvest(query=QUERIES[0], max_items=MAX_ITEMS, sort=SORT_ORDER, per_page=100,
+                              cache=cache, seen_index=seen_index, published_after=limit_date,
+                              checkpoint=checkpoint, stop_reasons=stop_reasons)
+        else:
+            records = harvest_many(queries=QUERIES, max_items=MAX_ITEMS, sort=SORT_ORDER, per_page=100,
+                                   cache=cache, seen_index=seen_index, published_after=limit_date,
+                                   checkpoint=checkpoint, stop_reasons=stop_reasons)
 
-    except KeyboardInterrupt:
-        print("\n사용자에 의해 수집이 중단되었습니다. 현재까지 수집된 데이터로 저장을 시도합니다.")
-
-    if not all_recs:
-        print("수집된 기사가 없습니다.")
-        return
+        def counted(recs):
+            nonlocal collected
+            for r in recs:
+                collected += 1
+                checkpoint.meta["collected"] = collected
+                # 실시간 진행 상황을 보기 위한 출력 (10개마다)
+                if collected % 10 == 0:
+                    print(f"  현재까지 {collected}건 수집됨...")
+                yield r
 
-    # 2. 중복 제거
-    deduped_recs = dedupe(all_recs)
-    print(f"수집 건수(중복 제거 전): {len(all_recs)}, (중복 제거 후): {len(deduped_recs)}")
+        # 2. 중복 제거 → 3. 파일 기록을 레코드 단위로 수행 (날짜 필터링은 harvest 가 스크래핑 전에 처리)
+        records = iter_dedupe(counted(records), seen=saved_titles)
+        if near_index is not None:
+            # 근사 중복 기사도 저장하고 표시만 함 (분석기가 대표 한 건만 분석하고 묶음 크기를 남김)
+            records = iter_near_tag(records, near_index)
+        for record in records:
+            near_dups += bool(record.get("near_dup_of"))
+            for sink in sinks:
+                sink.write(record)
+            saved += 1
+            if record.get("body_full"):
+                saved_keys.append({k: record.get(k) for k in ("response_hash", "originallink", "url")})
 
-    # 3. 날짜 필터링
-    if RECENT_DAYS_LIMIT > 0:
-        print(f"발행일 기준 최근 {RECENT_DAYS_LIMIT}일 이내 기사만 필터링합니다.")
-        limit_date = datetime.now(KST) - timedelta(days=RECENT_DAYS_LIMIT)
-        final_recs = [r for r in deduped_recs if datetime.strptime(r["published_at_kst"], "%Y-%m-%d %H:%M:%S%z") >= limit_date]
-        print(f"필터링 후 최종 건수: {len(final_recs)}")
-    else:
-        final_recs = deduped_recs
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n사용자에 의해 수집이 중단되었습니다. 현재까지 수집된 데이터를 저장합니다.")
+    except requests.exceptions.RequestException as e:
+        # Naver API 가 재시도 한도를 넘겨 계속 실패한 경우 (체크포인트가 남아 다음 실행에서 이어서 수집)
+        interrupted = True
+        print(f"\nAPI 요청이 계속 실패하여 수집을 중단합니다: {e}. 현재까지 수집된 데이터를 저장합니다.")
+    finally:
+        cache.close()
+        for sink in sinks:
+            sink.close()
+        checkpoint.close()
 
-    # 4. 파일 저장
-    if final_recs:
-        timestamp = datetime.now(KST).strftime("%Y%m%d_%H%M%S")
-        safe_query = "".join(c for c in QUERY if c.isalnum() or c in " ").strip().replace(" ", "_")
-        
+    print(f"수집 건수: {collected}, 저장 건수(중복 제거 후): {saved}, 근사 중복 표시: {near_dups}")
+    if saved:
         # 중단된 경우 파일명에 'incomplete' 추가
-        status_tag = "" if len(all_recs) >= MAX_ITEMS else "_incomplete"
-        base_filename = f"out/{timestamp}_{safe_query}{status_tag}"
-        
-        csv_path = f"{base_filename}.csv"
-        parquet_path = f"{base_filename}.parquet"
-
-        save_to_csv(final_recs, csv_path)
-        save_to_parquet(final_recs, parquet_path)
-        print(f"저장 완료: {csv_path}, {parquet_path}")
+        # (증분 모드는 새 기사가 적은 것이 정상이고, 모든 검색어가 발행일 기준일에 도달한 경우도 끝까지 수집한 것)
+        reached_cutoff = bool(stop_reasons) and all(
+            stop_reasons.get(q) in ("max_items", "cutoff") for q in QUERIES)
+        complete = not interrupted and (INCREMENTAL or collected >= MAX_ITEMS or reached_cutoff)
+        paths = [sink.path for sink in sinks if os.path.exists(sink.path)]
+        if not complete:
+            for i, path in enumerate(paths):
+                root, ext = os.path.splitext(path)
+                paths[i] = f"{root}_incomplete{ext}"
+                os.replace(path, paths[i])
+        print(f"저장 완료: {', '.join(paths)}")
     else:
         print("저장할 기사가 없습니다.")
+    if interrupted:
+        print(f"체크포인트 저장: {CHECKPOINT_PATH} (다시 실행하면 이어서 수집합니다)")
+    else:
+        checkpoint.clear()
+
+    # 실행 메트릭 (API 지연/쿼터, 호스트별 스크래핑 지연·바이트, 추출기별 결과) 저장
+    registry.dump(f"{base_filename}_metrics.json")
+    registry.dump(f"{base_filename}_metrics.prom")
+    print(f"메트릭 저장: {base_filename}_metrics.json / .prom")
+    if PROFILE:
+        print(f"프로파일 저장: {', '.join(dump_profiles('out/profile'))}")
+
+    # 4. 증분 인덱스 갱신 (저장이 끝난 뒤에 기록해야 중단 시 기사가 누락되지 않음)
+    if seen_index:
+        seen_index.add_records(saved_keys)
+        seen_index.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .config import CACHE_TTL_SEC, CACHE_MAX_ENTRIES
+from .utils import normalize_url
+
+class ScrapeCache:
+    """ 정규화된 기사 URL을 키로 추출 결과를 보관하는 SQLite 기반 영구 캐시
+
+    - TTL 이내 항목은 네트워크 요청 없이 그대로 사용
+    - TTL이 지난 항목은 ETag / Last-Modified 로 조건부 GET 재검증에 사용
+    - 검증자(ETag/Last-Modified)가 없는 만료 항목과,
+      max_entries 를 넘는 항목(오래 조회되지 않은 순)은 주기적으로 삭제
+    여러 스레드에서 동시에 사용해도 안전하다.
+    """
+
+    def __init__(self, path: str, ttl_sec: float = CACHE_TTL_SEC, max_entries: int = CACHE_MAX_ENTRIES):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS scrape_cache (
+                url TEXT PRIMARY KEY,
+                body_full TEXT NOT NULL,
+                extractor_used TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_scrape_cache_accessed ON scrape_cache(accessed_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """ 캐시 항목 조회. 'fresh' 키로 TTL 이내 여부를 함께 반환 """
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body_full, extractor_used, etag, last_modified, fetched_at FROM scrape_cache WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE scrape_cache SET accessed_at = ? WHERE url = ?", (now, key))
+            self._conn.commit()
+        body_full, extractor_used, etag, last_modified, fetched_at = row
+        return {
+            "body_full": body_full,
+            "extractor_used": extractor_used,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": fetched_at,
+            "fresh": now - fetched_at < self.ttl_sec,
+        }
+
+    def is_fresh(self, url: str) -> bool:
+        """ TTL 이내 항목이 있는지 여부 (네트워크 요청 생략 가능 여부 판단용) """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at FROM scrape_cache WHERE url = ?", (normalize_url(url),)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl_sec
+
+    def put(self, url: str, body_full: str, extractor_used: str,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """ 추출 결과 저장 (기존 항목은 덮어씀) """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scrape_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), body_full, extractor_used, etag, last_modified, now, now),
+            )
+            self._conn.commit()
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self._evict()
+
+    def touch(self, url: str):
+        """ 304 Not Modified 응답 시 fetched_at 을 갱신하여 TTL 연장 """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE scrape_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, normalize_url(url)),
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """ 재검증 불가능한 만료 항목과 최대 항목 수 초과분 삭제 (lock 보유 상태에서 호출) """
+        self._conn.execute(
+            "DELETE FROM scrape_cache WHERE fetched_at < ? AND etag IS NULL AND last_modified IS NULL",
+            (time.time() - self.ttl_sec,),
+        )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM scrape_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM scrape_cache WHERE url IN "
+                "(SELECT url FROM scrape_cache ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
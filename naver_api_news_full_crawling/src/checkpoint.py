@@ -0,0 +1,142 @@
+import os
+import json
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .config import CHECKPOINT_EVERY
+
+def _write_atomic(path: str, obj: Any):
+    """ 임시 파일에 쓴 뒤 교체 (원자적 저장) """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class HarvestCheckpoint:
+    """ 중단된 수집을 이어서 진행하기 위한 체크포인트
+
+    - path: 검색어별 페이징 커서(start, 그 페이지 이전까지 목록에 올린 건수), 수집 설정, 부가 정보(meta)
+      → 페이지가 끝날 때마다 원자적으로 다시 씀 (크기가 작음)
+    - path.pending: harvest_many 의 검색어 병합이 끝난 스크래핑 대상 목록 → 한 번만 씀
+    - path.done: 이번 수집에서 이미 내보낸 기사의 response_hash → 한 줄씩 이어 쓰고 every 건마다 fsync
+    어느 시점에 프로세스가 죽어도 커서는 직전 저장 상태, 처리 목록은 마지막 fsync 시점까지 남는다.
+    수집 설정(params)이 저장된 것과 다르면 이어서 수집하지 않는다.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: str, every: int = CHECKPOINT_EVERY):
+        self.path = path
+        self.pending_path = f"{path}.pending"
+        self.done_path = f"{path}.done"
+        self.every = every
+        self.state: Dict[str, Any] = {}
+        self._pending: Optional[List[Tuple[Dict[str, Any], List[str]]]] = None
+        self._done: set = set()
+        self._log = None
+        self._dirty = 0
+
+    def begin(self, params: Dict[str, Any], resume: bool = True) -> bool:
+        """ 같은 설정의 체크포인트가 있으면 불러와 True, 아니면 새 상태로 시작하여 False 반환 """
+        if resume and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == self.VERSION and state.get("params") == params:
+                self.state = state
+                if os.path.exists(self.pending_path):
+                    with open(self.pending_path, encoding="utf-8") as f:
+                        self._pending = json.load(f)
+                if os.path.exists(self.done_path):
+                    with open(self.done_path, encoding="utf-8") as f:
+                        # 비정상 종료로 잘린 마지막 줄은 어떤 해시와도 일치하지 않으므로 그대로 둠
+                        self._done = {line.strip() for line in f if line.strip()}
+                self._log = open(self.done_path, "a", encoding="utf-8")
+                return True
+            print(f"[info] 수집 설정이 달라 체크포인트를 무시하고 새로 시작합니다: {self.path}")
+        self._remove_files()
+        self.state = {"version": self.VERSION, "params": params, "cursor": {}, "meta": {}}
+        self._pending = None
+        self._done = set()
+        Path(self.done_path).parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(self.done_path, "w", encoding="utf-8")
+        self.save()
+        return False
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.state["meta"]
+
+    # --- 페이징 커서 ---
+    def cursor(self, query: str) -> Tuple[int, int]:
+        """ (다음에 요청할 start, 그 이전 페이지까지 목록에 올린 건수) """
+        start, listed = self.state["cursor"].get(query, (1, 0))
+        return start, listed
+
+    def advance(self, query: str, start: int, listed: int):
+        """ 한 페이지의 기사를 모두 내보낸 뒤 호출 (다음 페이지부터 이어서 수집) """
+        self.state["cursor"][query] = (start, listed)
+        self.save()
+
+    # --- 검색어 병합 결과 (harvest_many) ---
+    @property
+    def pending(self) -> Optional[List[Tuple[Dict[str, Any], List[str]]]]:
+        return self._pending
+
+    def set_pending(self, items: List[Tuple[Dict[str, Any], List[str]]]):
+        self._pending = [list(entry) for entry in items]
+        _write_atomic(self.pending_path, self._pending)
+
+    # --- 처리한 기사 ---
+    def is_done(self, key: str) -> bool:
+        return key in self._done
+
+    def mark_done(self, key: str):
+        if key in self._done:
+            return
+        self._done.add(key)
+        self._log.write(key + "\n")
+        self._dirty += 1
+        if self._dirty >= self.every:
+            self._sync_done()
+
+    @property
+    def done_count(self) -> int:
+        return len(self._done)
+
+    def _sync_done(self):
+        if self._log:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        self._dirty = 0
+
+    def save(self):
+        """ 처리 목록을 디스크에 내리고 커서/설정 파일을 원자적으로 다시 씀 """
+        self._sync_done()
+        self.state["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        _write_atomic(self.path, self.state)
+
+    def close(self):
+        if self.state:
+            self.save()
+        if self._log:
+            self._log.close()
+            self._log = None
+
+    def _remove_files(self):
+        for path in (self.path, self.pending_path, self.done_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def clear(self):
+        """ 수집이 끝까지 완료되면 체크포인트 삭제 """
+        if self._log:
+            self._log.close()
+            self._log = None
+        self.state = {}
+        self._pending = None
+        self._done = set()
+        self._remove_files()
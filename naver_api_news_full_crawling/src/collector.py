@@ -2,65 +2,304 @@ import time
 import uuid
 import random
 import requests
-from typing import Dict, Any, Iterator
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 
-from .config import NAVER_NEWS_URL, KST
-from .utils import load_api_keys, strip_html_tags, parse_pubdate_to_kst, sha256_of_item
+from .config import (NAVER_NEWS_URL, NAVER_API_DAILY_QUOTA, KST, SCRAPE_WORKERS, HOST_MIN_INTERVAL, API_MIN_INTERVAL,
+                     API_MAX_RETRIES, API_BACKOFF_BASE, API_BACKOFF_MAX)
+from .utils import load_api_keys, strip_html_tags, parse_pubdate, parse_pubdate_to_kst, sha256_of_item, normalize_url
 from .scraper import scrape_full_body
+from .throttle import HostThrottle, host_of
+from .session import get_session
+from .cache import ScrapeCache
+from .seen import SeenIndex
+from .checkpoint import HarvestCheckpoint
+from .health import HostHealth, get_host_health
+from .metrics import registry, profiled
 
-def request_news(query: str, display: int, start: int, sort: str, headers: Dict[str, Any]) -> Dict[str, Any]:
-    """ Naver News API에 검색 요청 """
+@profiled("request_news")
+def request_news(query: str, display: int, start: int, sort: str, headers: Dict[str, Any],
+                 session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """ Naver News API에 검색 요청 (호출 지연 시간, 상태 코드, 쿼터 사용량을 메트릭에 기록) """
     params = {"query": query, "display": display, "start": start, "sort": sort}
-    resp = requests.get(NAVER_NEWS_URL, headers=headers, params=params, timeout=15)
-    resp.raise_for_status()
-    return resp.json()
+    status = "error"
+    try:
+        with registry.timer("naver_api_request_seconds"):
+            resp = (session or get_session()).get(NAVER_NEWS_URL, headers=headers, params=params, timeout=15)
+        status = str(resp.status_code)
+        resp.raise_for_status()
+        data = resp.json()
+        registry.inc("naver_api_items_total", len(data.get("items", [])))
+        return data
+    finally:
+        # 실패한 호출도 일일 한도에 포함됨
+        registry.inc("naver_api_requests_total", status=status)
+        registry.inc("naver_api_quota_used_total")
+        registry.set("naver_api_quota_used_ratio",
+                     registry.value("naver_api_quota_used_total") / NAVER_API_DAILY_QUOTA)
 
-def harvest(query: str, max_items: int, sort: str, per_page: int) -> Iterator[Dict[str, Any]]:
-    """ API 호출과 스크래핑을 조율하여 기사 데이터를 수집하는 제너레이터 """
+def make_throttle() -> HostThrottle:
+    """ 언론사 호스트별 간격과 API 전용 간격을 적용한 기본 스케줄러 """
+    return HostThrottle(HOST_MIN_INTERVAL, overrides={host_of(NAVER_NEWS_URL): API_MIN_INTERVAL})
+
+def _scrape_item(item: Dict[str, Any], throttle: HostThrottle, session: requests.Session,
+                 cache: Optional[ScrapeCache] = None,
+                 health: Optional[HostHealth] = None) -> Tuple[Dict[str, Any], str, str]:
+    """ 아이템 하나의 본문을 스크래핑 (워커 스레드에서 실행) """
+    scrape_url = item.get("originallink") or item.get("link")
+    health = health or get_host_health()
+    host = host_of(scrape_url)
+    # 캐시에서 바로 가져오거나 차단 중인 호스트는 요청하지 않으므로 간격 대기도 생략
+    if not (cache and cache.is_fresh(scrape_url)) and not health.is_open(host):
+        registry.observe("throttle_wait_seconds", throttle.wait(scrape_url), host=host)
+    full_body, extractor = scrape_full_body(scrape_url, referer=item.get("link"),
+                                            session=session, cache=cache, health=health)
+    if not full_body:
+        print(f"[info] 본문 추출 실패: {scrape_url} (방법: {extractor})")
+    return item, full_body, extractor
+
+def _interleave_by_host(items: List[Dict[str, Any]]) -> List[int]:
+    """ 같은 호스트가 연달아 오지 않도록 아이템 인덱스를 호스트별 라운드로빈 순서로 정렬 """
+    buckets: Dict[str, List[int]] = {}
+    for idx, item in enumerate(items):
+        buckets.setdefault(host_of(item.get("originallink") or item.get("link")), []).append(idx)
+    order = []
+    queues = list(buckets.values())
+    while queues:
+        order.extend(q.pop(0) for q in queues)
+        queues = [q for q in queues if q]
+    return order
+
+def _build_record(query: str, item: Dict[str, Any], full_body: str, extractor: str,
+                  matched_queries: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """ API 아이템과 스크래핑 결과로 출력 레코드 생성 """
+    return {
+        "id": str(uuid.uuid4()),
+        "source": "naver_news_api",
+        "query": query,
+        "matched_queries": "|".join(matched_queries or [query]),
+        "title": strip_html_tags(item.get("title", "")),
+        "body_text": strip_html_tags(item.get("description", "")),
+        "body_full": full_body,
+        "extractor_used": extractor,
+        "url": item.get("link"),
+        "originallink": item.get("originallink"),
+        "published_at_kst": parse_pubdate_to_kst(item.get("pubDate", "")),
+        "first_seen_at_kst": time.strftime("%Y-%m-%d %H:%M:%S%z", time.gmtime()),
+        "lang": "ko",
+        "response_hash": sha256_of_item(item),
+        "version": "v1"
+    }
+
+def _api_headers() -> Dict[str, str]:
     cid, csec = load_api_keys()
-    api_headers = {"X-Naver-Client-Id": cid, "X-Naver-Client-Secret": csec}
-    
-    total_fetched, start = 0, 1
+    return {"X-Naver-Client-Id": cid, "X-Naver-Client-Secret": csec}
+
+def _iter_pages(query: str, max_items: int, sort: str, per_page: int, api_headers: Dict[str, str],
+                throttle: HostThrottle, session: requests.Session,
+                seen_index: Optional[SeenIndex] = None,
+                published_after: Optional[datetime] = None,
+                checkpoint: Optional[HarvestCheckpoint] = None,
+                stop_reasons: Optional[Dict[str, str]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """ API 페이지를 넘기며 스크래핑 대상 아이템 목록을 페이지 단위로 yield (합계 max_items 이하)
+
+    checkpoint 를 넘기면 저장된 커서의 페이지부터 시작하고, 이미 처리한 기사는 건수에만 포함하며,
+    호출 측이 페이지를 다 소비하면 커서를 다음 페이지로 옮긴다.
+    stop_reasons 를 넘기면 페이징을 끝까지 마친 경우 종료 사유를 stop_reasons[query] 에 기록한다
+    ("max_items", "cutoff": 발행일 기준일 도달, "seen": 이전 수집 기사 도달, "exhausted": 결과 없음, "api_limit": start 한도).
+    """
+    start, total_listed = checkpoint.cursor(query) if checkpoint else (1, 0)
     max_start = 1000
 
-    while total_fetched < max_items and start <= max_start:
-        time.sleep(random.uniform(0.2, 0.6))
+    reason = None
+    attempt = 0
+    while total_listed < max_items and start <= max_start:
+        throttle.wait(NAVER_NEWS_URL)
         try:
-            data = request_news(query, per_page, start, sort, api_headers)
+            data = request_news(query, per_page, start, sort, api_headers, session)
         except requests.exceptions.RequestException as e:
-            print(f"[warn] API 요청 실패, 재시도: {e}")
-            time.sleep(5)
+            status = e.response.status_code if e.response is not None else None
+            # 인증/요청 오류(4xx, 429 제외)는 재시도해도 같으므로 바로 중단
+            if status and 400 <= status < 500 and status != 429:
+                raise
+            attempt += 1
+            if attempt > API_MAX_RETRIES:
+                print(f"[error] '{query}' start={start} API 요청이 {API_MAX_RETRIES}회 재시도 후에도 실패했습니다.")
+                raise
+            delay = min(API_BACKOFF_MAX, API_BACKOFF_BASE * 2 ** (attempt - 1))
+            delay *= random.uniform(0.5, 1.0)  # 여러 검색어가 동시에 재시도하지 않도록 jitter
+            print(f"[warn] API 요청 실패, {delay:.1f}초 후 재시도 ({attempt}/{API_MAX_RETRIES}): {e}")
+            registry.inc("naver_api_retries_total")
+            time.sleep(delay)
             continue
+        attempt = 0
 
         items = data.get("items", [])
-        if not items: break
-
-        for item in items:
-            scrape_url = item.get("originallink") or item.get("link")
-            if not scrape_url: continue
-            
-            full_body, extractor = scrape_full_body(scrape_url, referer=item.get("link"))
-            if not full_body:
-                print(f"[info] 본문 추출 실패: {scrape_url} (방법: {extractor})")
-
-            time.sleep(random.uniform(0.1, 0.3))
-
-            yield {
-                "id": str(uuid.uuid4()),
-                "source": "naver_news_api",
-                "query": query,
-                "title": strip_html_tags(item.get("title", "")),
-                "body_text": strip_html_tags(item.get("description", "")),
-                "body_full": full_body,
-                "extractor_used": extractor,
-                "url": item.get("link"),
-                "originallink": item.get("originallink"),
-                "published_at_kst": parse_pubdate_to_kst(item.get("pubDate", "")),
-                "first_seen_at_kst": time.strftime("%Y-%m-%d %H:%M:%S%z", time.gmtime()),
-                "lang": "ko",
-                "response_hash": sha256_of_item(item),
-                "version": "v1"
-            }
-            total_fetched += 1
-            if total_fetched >= max_items: break
-        start += per_page
\ No newline at end of file
+        if not items:
+            reason = "exhausted"
+            break
+
+        targets: List[Dict[str, Any]] = [
+            it for it in items if it.get("originallink") or it.get("link")
+        ]
+        past_cutoff = False
+        if published_after:
+            # pubDate 를 해석할 수 없는 기사는 기존 동작(현재 시각 처리)과 같이 남겨둠
+            recent = []
+            for it in targets:
+                pub = parse_pubdate(it.get("pubDate", ""))
+                if pub and pub < published_after:
+                    past_cutoff = True
+                else:
+                    recent.append(it)
+            targets = recent
+        done = 0
+        if checkpoint:
+            # 중단 전에 이미 처리한 기사 (증분 인덱스 판정과 별개로 목록 건수에만 포함)
+            remaining = [it for it in targets if not checkpoint.is_done(sha256_of_item(it))]
+            done, targets = len(targets) - len(remaining), remaining
+        if seen_index:
+            targets = [it for it in targets if not seen_index.contains(
+                sha256_of_item(it), it.get("originallink") or it.get("link"))]
+            if not targets and not done and sort == "date" and not past_cutoff:
+                print(f"[info] '{query}' start={start} 페이지가 모두 이전에 수집한 기사이므로 수집을 종료합니다.")
+                reason = "seen"
+                break
+        targets = targets[:max(0, max_items - total_listed - done)]
+
+        yield targets
+        total_listed += done + len(targets)
+        start += per_page
+        if checkpoint:
+            checkpoint.advance(query, start, total_listed)
+        if past_cutoff and sort == "date":
+            # 최신순 정렬에서는 기준일 이전 기사가 나오면 이후 페이지도 모두 기준일 이전
+            print(f"[info] '{query}' start={start - per_page} 페이지에서 발행일 기준일에 도달하여 수집을 종료합니다.")
+            reason = "cutoff"
+            break
+    if stop_reasons is not None:
+        stop_reasons[query] = reason or ("max_items" if total_listed >= max_items else "api_limit")
+
+def _scrape_targets(targets: List[Dict[str, Any]], executor: Optional[ThreadPoolExecutor],
+                    throttle: HostThrottle, session: requests.Session,
+                    cache: Optional[ScrapeCache] = None,
+                    health: Optional[HostHealth] = None) -> Iterator[Tuple[Dict[str, Any], str, str]]:
+    """ 아이템 목록의 본문을 (가능하면 동시에) 스크래핑하여 입력 순서대로 yield """
+    if executor:
+        # 서로 다른 호스트부터 먼저 제출해 워커가 같은 호스트 대기로 묶이지 않게 함
+        futures = {idx: executor.submit(_scrape_item, targets[idx], throttle, session, cache, health)
+                   for idx in _interleave_by_host(targets)}
+        return (futures[idx].result() for idx in range(len(targets)))
+    return (_scrape_item(it, throttle, session, cache, health) for it in targets)
+
+def harvest(query: str, max_items: int, sort: str, per_page: int,
+            workers: int = SCRAPE_WORKERS,
+            throttle: Optional[HostThrottle] = None,
+            session: Optional[requests.Session] = None,
+            cache: Optional[ScrapeCache] = None,
+            seen_index: Optional[SeenIndex] = None,
+            published_after: Optional[datetime] = None,
+            checkpoint: Optional[HarvestCheckpoint] = None,
+            health: Optional[HostHealth] = None,
+            stop_reasons: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """ API 호출과 스크래핑을 조율하여 기사 데이터를 수집하는 제너레이터
+
+    workers > 1 이면 한 페이지의 본문 스크래핑을 스레드 풀에서 동시에 수행하며,
+    레코드는 API 응답 순서대로 yield 된다. 요청 간격은 throttle 이 호스트별로 조절한다.
+    session 을 넘기면 API 요청과 본문 스크래핑 모두 해당 세션의 커넥션 풀을 재사용한다.
+    cache 를 넘기면 이미 추출한 기사 URL은 캐시에서 가져오거나 조건부 GET 으로 재검증한다.
+    seen_index 를 넘기면 증분 모드로 동작한다: 이전에 수집한 기사는 건너뛰고,
+    sort="date" 일 때 한 페이지가 모두 이미 본 기사이면 페이징을 멈춘다.
+    published_after 를 넘기면 스크래핑 전에 pubDate 로 기준일 이전 기사를 걸러내고,
+    sort="date" 일 때 기준일을 지난 페이지에서 페이징을 멈춘다.
+    checkpoint 를 넘기면 페이징 커서와 내보낸 기사를 기록하고, 저장된 상태가 있으면
+    중단된 페이지부터 이어서 이미 내보낸 기사는 다시 스크래핑하지 않는다.
+    기사는 호출 측이 레코드를 받아 처리한 뒤(다음 레코드를 요청할 때) 처리 완료로 기록된다.
+    health 는 언론사 호스트별 circuit breaker / timeout 추적기이며, 미지정 시 프로세스 공유 추적기를 쓴다.
+    API 요청 실패는 지수 backoff 로 API_MAX_RETRIES 회까지 재시도한 뒤 예외를 그대로 전달한다.
+    stop_reasons 를 넘기면 검색어별 페이징 종료 사유를 기록한다 (_iter_pages 참고, 예: 기준일 도달은 "cutoff").
+    """
+    api_headers = _api_headers()
+    throttle = throttle or make_throttle()
+    session = session or get_session()
+
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for targets in _iter_pages(query, max_items, sort, per_page, api_headers,
+                                   throttle, session, seen_index, published_after, checkpoint, stop_reasons):
+            for item, full_body, extractor in _scrape_targets(targets, executor, throttle, session, cache, health):
+                record = _build_record(query, item, full_body, extractor)
+                yield record
+                if checkpoint:
+                    checkpoint.mark_done(record["response_hash"])
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def harvest_many(queries: Sequence[str], max_items: int, sort: str, per_page: int,
+                 workers: int = SCRAPE_WORKERS,
+                 throttle: Optional[HostThrottle] = None,
+                 session: Optional[requests.Session] = None,
+                 cache: Optional[ScrapeCache] = None,
+                 seen_index: Optional[SeenIndex] = None,
+                 published_after: Optional[datetime] = None,
+                 checkpoint: Optional[HarvestCheckpoint] = None,
+                 health: Optional[HostHealth] = None,
+                 stop_reasons: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """ 여러 검색어를 한 번에 수집하는 제너레이터
+
+    1) 검색어별 API 페이징을 동시에 수행한다 (API 요청 간격은 공유 throttle 로 제한).
+    2) 원문 URL 기준으로 검색어 간 중복을 제거하여 기사 본문은 한 번만 스크래핑한다.
+    레코드의 query 는 처음 매칭된 검색어, matched_queries 는 매칭된 모든 검색어('|' 구분)이다.
+    max_items 는 검색어별 최대 목록 건수이며, 나머지 인자는 harvest 와 같다.
+    checkpoint 에는 병합이 끝난 스크래핑 대상 목록을 저장하므로, 이어서 수집할 때는 목록 조회 없이
+    아직 내보내지 않은 기사부터 스크래핑한다 (목록 조회 도중 중단되면 목록 조회부터 다시 수행).
+    """
+    api_headers = _api_headers()
+    throttle = throttle or make_throttle()
+    session = session or get_session()
+
+    def list_query(query: str) -> List[Dict[str, Any]]:
+        listed = []
+        for targets in _iter_pages(query, max_items, sort, per_page, api_headers,
+                                   throttle, session, seen_index, published_after, stop_reasons=stop_reasons):
+            listed.extend(targets)
+        print(f"[info] '{query}' 목록 {len(listed)}건")
+        return listed
+
+    if checkpoint and checkpoint.pending is not None:
+        unique = [(item, matched) for item, matched in checkpoint.pending]
+        print(f"[info] 체크포인트에서 스크래핑 대상 {len(unique)}건을 불러왔습니다 (처리 완료 {checkpoint.done_count}건)")
+    else:
+        # 검색어 순서를 유지한 채 URL 기준으로 병합
+        merged: Dict[str, Tuple[Dict[str, Any], List[str]]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(queries))) as pager:
+            for query, listed in zip(queries, pager.map(list_query, queries)):
+                for item in listed:
+                    key = normalize_url(item.get("originallink") or item.get("link"))
+                    if key in merged:
+                        if query not in merged[key][1]:
+                            merged[key][1].append(query)
+                    else:
+                        merged[key] = (item, [query])
+        unique = list(merged.values())
+        print(f"[info] 검색어 {len(queries)}개, 중복 제거 후 스크래핑 대상 {len(unique)}건")
+        if checkpoint:
+            checkpoint.set_pending(unique)
+    if checkpoint:
+        unique = [entry for entry in unique if not checkpoint.is_done(sha256_of_item(entry[0]))]
+
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for offset in range(0, len(unique), per_page):
+            chunk = unique[offset:offset + per_page]
+            scraped = _scrape_targets([item for item, _ in chunk], executor, throttle, session, cache, health)
+            for (item, full_body, extractor), (_, matched) in zip(scraped, chunk):
+                record = _build_record(matched[0], item, full_body, extractor, matched)
+                yield record
+                if checkpoint:
+                    checkpoint.mark_done(record["response_hash"])
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,7 +1,51 @@
+import os
 from datetime import timezone, timedelta
 
-# API 및 스크래핑 설정
-NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news.json"
+# API 및 스크래핑 설정 (NAVER_NEWS_URL 환경변수로 로컬 벤치마크 서버 등으로 바꿀 수 있음)
+NAVER_NEWS_URL = os.getenv("NAVER_NEWS_URL", "https://openapi.naver.com/v1/search/news.json")
 KST = timezone(timedelta(hours=9))
 BROWSER_UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-              "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
\ No newline at end of file
+              "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
+
+# Naver 검색 API 일일 호출 한도 (메트릭의 쿼터 사용률 계산용)
+NAVER_API_DAILY_QUOTA = 25_000
+
+# 동시 스크래핑 설정 (1이면 순차 처리)
+SCRAPE_WORKERS = 8
+
+# 호스트별 요청 간격(초, 최소~최대). 같은 언론사에만 적용되고 서로 다른 호스트는 대기하지 않음
+HOST_MIN_INTERVAL = (1.0, 2.0)
+# Naver API 엔드포인트 전용 요청 간격(초, 최소~최대)
+API_MIN_INTERVAL = (0.2, 0.4)
+
+# HTTP 커넥션 풀 설정 (keep-alive 세션 재사용)
+POOL_CONNECTIONS = 32   # 풀을 유지할 호스트 수
+POOL_MAXSIZE = 8        # 호스트당 커넥션 수
+HTTP_RETRIES = 2        # Naver API 연결 오류 / 429·5xx 재시도 횟수 (기사 요청은 재시도하지 않음)
+HTTP_BACKOFF = 0.5      # 재시도 backoff 계수(초)
+
+# 본문 스크래핑 캐시 설정
+CACHE_PATH = "cache/scrape_cache.sqlite"
+CACHE_TTL_SEC = 3 * 24 * 3600   # 이 기간 내 항목은 네트워크 요청 없이 재사용
+CACHE_MAX_ENTRIES = 200_000
+
+# 증분 수집용 기수집 기사 인덱스
+SEEN_INDEX_PATH = "cache/seen_index.sqlite"
+
+# 중단 후 이어서 수집하기 위한 체크포인트 (검색어별 페이징 커서, 처리한 기사 해시)
+CHECKPOINT_PATH = "cache/harvest_checkpoint.json"
+CHECKPOINT_EVERY = 20   # 기사 이 건수마다 체크포인트 저장 (페이지가 끝날 때도 저장)
+
+# 호스트별 circuit breaker: 연속 실패 시 cool-down 동안 해당 언론사 요청 차단 (다시 실패하면 cool-down 두 배)
+BREAKER_FAILURES = 5
+BREAKER_COOLDOWN_SEC = 60
+BREAKER_MAX_COOLDOWN_SEC = 600
+# 본문 요청 timeout(초): 표본이 쌓이기 전 기본값, 이후 호스트별 응답 시간 p95 * 3 을 최소~최대로 제한
+SCRAPE_TIMEOUT = 10
+SCRAPE_TIMEOUT_MIN = 3
+SCRAPE_TIMEOUT_MAX = 10
+
+# Naver API 요청 실패 시 지수 backoff 재시도 (base * 2^n 초, 최대 max 초, 최대 retries 회)
+API_MAX_RETRIES = 5
+API_BACKOFF_BASE = 1.0
+API_BACKOFF_MAX = 60.0
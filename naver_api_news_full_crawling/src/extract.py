@@ -0,0 +1,178 @@
+import re
+import time
+import codecs
+import threading
+from copy import deepcopy
+from collections import defaultdict, Counter
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import lxml.html
+from lxml import etree
+
+from .throttle import host_of
+from .metrics import registry, profiled
+
+# --- 라이브러리 임포트 (없으면 None) ---
+try:
+    import trafilatura
+except ImportError:
+    trafilatura = None
+try:
+    from readability import Document
+except ImportError:
+    Document = None
+
+MIN_BODY_LEN = 100  # 이보다 짧은 추출 결과는 실패로 보고 다음 추출기로 넘어감
+
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_XML_DECL = re.compile(r"^\s*<\?xml[^>]*\?>")
+_SKIP_TAGS = {"script", "style"}
+# 국내 언론사가 선언하는 euc-kr 페이지에는 cp949 확장 문자가 섞여 있는 경우가 많음
+_ENCODING_ALIASES = {"euc_kr": "cp949", "ks_c_5601-1987": "cp949", "ks_c_5601": "cp949"}
+
+
+def _valid_encoding(name: Union[bytes, str]) -> Optional[str]:
+    if isinstance(name, bytes):
+        name = name.decode("ascii", errors="ignore")
+    name = _ENCODING_ALIASES.get(name.lower(), name)
+    try:
+        codec = codecs.lookup(name).name
+    except LookupError:
+        return None
+    return _ENCODING_ALIASES.get(codec, codec)
+
+
+def detect_encoding(content: bytes, headers: Mapping[str, str],
+                    fallback: Optional[Callable[[], str]] = None) -> str:
+    """ Content-Type 헤더 → BOM → <meta charset> (앞 4KB) 순으로 인코딩을 결정
+
+    어느 것도 없을 때만 fallback(예: resp.apparent_encoding, 본문 전체 문자셋 감지)을 호출한다.
+    """
+    m = _HEADER_CHARSET.search(headers.get("Content-Type", "") or "")
+    enc = _valid_encoding(m.group(1)) if m else None
+    if enc:
+        return enc
+    if content.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    m = _META_CHARSET.search(content[:4096])
+    enc = _valid_encoding(m.group(1)) if m else None
+    if enc:
+        return enc
+    return (fallback() if fallback else None) or "utf-8"
+
+
+def parse_html(content: bytes, encoding: str) -> Optional[lxml.html.HtmlElement]:
+    """ HTML 을 한 번만 파싱하여 모든 추출기가 공유할 lxml 트리 반환 (빈 문서면 None) """
+    text = _XML_DECL.sub("", content.decode(encoding, errors="replace"), count=1)
+    try:
+        return lxml.html.document_fromstring(text)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def tree_text(node) -> str:
+    """ BeautifulSoup.get_text(separator="\\n", strip=True) 와 같은 규칙의 텍스트 추출
+
+    script/style 내용과 주석은 제외하고, 공백을 제거한 텍스트 조각을 줄바꿈으로 잇는다.
+    트리를 수정하지 않으므로 공유 트리에 그대로 사용할 수 있다.
+    """
+    parts = []
+
+    # 문서 순서 유지: 요소의 text → 자식들 → tail 순서로 수집
+    def walk(el):
+        if isinstance(el.tag, str) and el.tag.lower() not in _SKIP_TAGS:
+            if el.text:
+                parts.append(el.text)
+            for child in el:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+
+    walk(node)
+    return "\n".join(p for p in (s.strip() for s in parts) if p)
+
+
+def _by_trafilatura(tree) -> Optional[str]:
+    # trafilatura 는 트리를 제자리에서 정리하므로 복사본을 넘김 (재파싱보다 훨씬 저렴)
+    return trafilatura.extract(deepcopy(tree), include_comments=False, include_tables=False)
+
+
+def _by_readability(tree) -> Optional[str]:
+    # readability 는 내부 Cleaner 가 트리를 복사하여 사용
+    summary = Document(tree).summary()
+    return tree_text(lxml.html.document_fromstring(summary))
+
+
+EXTRACTORS: Dict[str, Callable] = {}
+if trafilatura:
+    EXTRACTORS["trafilatura"] = _by_trafilatura
+if Document:
+    EXTRACTORS["readability"] = _by_readability
+
+
+class ExtractorStats:
+    """ 도메인별로 어떤 추출기가 본문 추출에 성공했는지 기억하여, 성공 횟수가 많은 추출기부터 시도
+
+    <body> 전체 텍스트(fallback_body)는 거의 항상 길이 조건을 통과하므로 순위에 넣지 않고 항상 마지막에 둔다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wins: Dict[str, Counter] = defaultdict(Counter)
+
+    def order(self, host: str) -> List[str]:
+        with self._lock:
+            wins = dict(self._wins.get(host, {}))
+        names = list(EXTRACTORS)
+        # 성공 횟수 내림차순, 같으면 기본 순서(trafilatura → readability)
+        return sorted(names, key=lambda n: (-wins.get(n, 0), names.index(n)))
+
+    def record(self, host: str, extractor: str):
+        with self._lock:
+            self._wins[host][extractor] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {host: dict(c) for host, c in self._wins.items()}
+
+
+_default_stats = ExtractorStats()
+
+
+def get_extractor_stats() -> ExtractorStats:
+    """ 프로세스 전체에서 공유하는 도메인별 추출기 성공 기록 """
+    return _default_stats
+
+
+@profiled("extract_body")
+def extract_body(content: bytes, headers: Mapping[str, str], url: str = "",
+                 encoding_fallback: Optional[Callable[[], str]] = None,
+                 stats: Optional[ExtractorStats] = None) -> Tuple[str, str]:
+    """ 한 번 파싱한 트리로 추출기를 도메인별 성공 순서대로 시도하고, 첫 성공에서 바로 반환 """
+    start = time.perf_counter()
+    text, extractor = _extract(content, headers, url, encoding_fallback, stats or _default_stats)
+    registry.observe("extract_seconds", time.perf_counter() - start, extractor=extractor)
+    return text, extractor
+
+
+def _extract(content: bytes, headers: Mapping[str, str], url: str,
+             encoding_fallback: Optional[Callable[[], str]], stats: ExtractorStats) -> Tuple[str, str]:
+    tree = parse_html(content, detect_encoding(content, headers, encoding_fallback))
+    if tree is None:
+        return "", "extract_failed"
+
+    host = host_of(url)
+    for name in stats.order(host):
+        try:
+            text = EXTRACTORS[name](tree)
+        except Exception:
+            text = None
+        if text and len(text) > MIN_BODY_LEN:
+            stats.record(host, name)
+            return text, name
+
+    body = tree.find("body")
+    if body is not None:
+        return tree_text(body), "fallback_body"
+    return "", "extract_failed"
@@ -0,0 +1,135 @@
+import time
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from .config import (BREAKER_FAILURES, BREAKER_COOLDOWN_SEC, BREAKER_MAX_COOLDOWN_SEC,
+                     SCRAPE_TIMEOUT, SCRAPE_TIMEOUT_MIN, SCRAPE_TIMEOUT_MAX)
+from .metrics import registry
+
+class _HostState:
+    __slots__ = ("latencies", "failures", "trips", "open_until", "probing", "insecure")
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.failures = 0          # 연속 실패 횟수
+        self.trips = 0             # 성공 없이 연속으로 차단된 횟수 (cool-down 을 늘리는 데 사용)
+        self.open_until = 0.0      # 이 시각(monotonic)까지 요청 차단
+        self.probing = False       # cool-down 이 끝난 뒤 시험 요청이 진행 중인지 여부
+        self.insecure = False      # SSL 검증 실패로 verify=False 재시도가 필요했던 호스트
+
+class HostHealth:
+    """ 언론사 호스트별 상태 추적 (circuit breaker + 지연 시간 기반 timeout)
+
+    - 연속 failures 회 실패하면 cooldown 초 동안 해당 호스트 요청을 차단하고(open),
+      cool-down 이 끝나면 한 건만 시험 요청을 보내 성공하면 닫고 실패하면 cool-down 을 두 배로 늘려 다시 차단한다.
+    - timeout 은 최근 window 건 응답 시간의 p95 * multiplier 를 [min_timeout, max_timeout] 으로 제한한 값이며,
+      표본이 min_samples 건 미만이면 default_timeout 을 쓴다.
+    여러 스레드에서 동시에 사용해도 안전하다.
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN_SEC,
+                 max_cooldown: float = BREAKER_MAX_COOLDOWN_SEC, default_timeout: float = SCRAPE_TIMEOUT,
+                 min_timeout: float = SCRAPE_TIMEOUT_MIN, max_timeout: float = SCRAPE_TIMEOUT_MAX,
+                 multiplier: float = 3.0, window: int = 50, min_samples: int = 5):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self.window = window
+        self.min_samples = min_samples
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.window)
+        return state
+
+    def is_open(self, host: str) -> bool:
+        """ 차단 중인지 확인만 함 (시험 요청 기회를 소모하지 않음) """
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and (time.monotonic() < state.open_until or state.probing)
+
+    def allow(self, host: str) -> bool:
+        """ 요청을 보내도 되는지 판단 (cool-down 이 끝난 뒤에는 시험 요청 한 건만 허용) """
+        with self._lock:
+            state = self._state(host)
+            if state.failures < self.failures:
+                return True
+            if time.monotonic() < state.open_until or state.probing:
+                return False
+            state.probing = True
+            return True
+
+    def timeout(self, host: str) -> float:
+        """ 호스트의 최근 응답 시간 p95 기반 timeout(초) """
+        with self._lock:
+            samples = sorted(self._state(host).latencies)
+        if len(samples) < self.min_samples:
+            return self.default_timeout
+        p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.multiplier))
+
+    def record_success(self, host: str, elapsed: float):
+        with self._lock:
+            state = self._state(host)
+            state.latencies.append(elapsed)
+            state.failures = state.trips = 0
+            state.open_until = 0.0
+            state.probing = False
+
+    def record_failure(self, host: str, reason: str = "error"):
+        """ 연결 오류 / timeout / 차단(403·429) / 5xx 등 호스트 문제로 인한 실패 기록 """
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            state.failures += 1
+            state.probing = False
+            failures = state.failures
+            # 이미 차단 중일 때 끝난 (차단 전에 보낸) 요청의 실패는 cool-down 을 늘리지 않음
+            tripped = failures >= self.failures and now >= state.open_until
+            if tripped:
+                cooldown = min(self.max_cooldown, self.cooldown * 2 ** state.trips)
+                state.open_until = now + cooldown
+                state.trips += 1
+        registry.inc("host_failures_total", host=host, reason=reason)
+        if tripped:
+            registry.inc("host_circuit_trips_total", host=host)
+            print(f"[warn] {host} 연속 {failures}회 실패({reason}) → {cooldown:.0f}초 동안 요청 차단")
+
+    def mark_insecure(self, host: str):
+        with self._lock:
+            self._state(host).insecure = True
+
+    def is_insecure(self, host: str) -> bool:
+        with self._lock:
+            state = self._hosts.get(host)
+            return state is not None and state.insecure
+
+    def snapshot(self) -> Dict[str, dict]:
+        """ 호스트별 연속 실패 / 차단 여부 / 현재 timeout 요약 """
+        with self._lock:
+            hosts = list(self._hosts)
+            now = time.monotonic()
+            summary = {h: {"failures": s.failures, "open": now < s.open_until, "samples": len(s.latencies)}
+                       for h, s in self._hosts.items()}
+        for h in hosts:
+            summary[h]["timeout"] = round(self.timeout(h), 2)
+        return summary
+
+_default_health: Optional[HostHealth] = None
+_default_lock = threading.Lock()
+
+def get_host_health() -> HostHealth:
+    """ 프로세스 전체에서 공유하는 호스트 상태 추적기 반환 (최초 호출 시 생성) """
+    global _default_health
+    with _default_lock:
+        if _default_health is None:
+            _default_health = HostHealth()
+        return _default_health
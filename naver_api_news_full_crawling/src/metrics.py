@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import bisect
+import cProfile
+import pstats
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+## 스테이지별 계측 (카운터 / 게이지 / 히스토그램) 과 선택적 cProfile 훅
+## - registry.inc / set / observe / timer 로 기록하고, dump() 로 JSON 또는 Prometheus 텍스트 형식 저장
+## - @profiled 로 감싼 함수는 enable_profiling() 이후에만 cProfile 로 측정 (꺼져 있으면 거의 비용 없음)
+## - bert/src/metrics.py 와 같은 코드의 복사본 (크롤러와 분석기는 따로 배포되어 공유 패키지가 없음).
+##   분석기 쪽에만 있는 export_state / merge 는 멀티 프로세스 추론용이며, 공통 부분을 바꾸면 양쪽을 함께 수정
+
+# 지연 시간(초) 히스토그램 기본 버킷
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _prom_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return "{" + ",".join(f"{k}=\"{esc(v)}\"" for k, v in pairs) + "}"
+
+
+def _prom_value(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """ 버킷 경계 사이 선형 보간으로 추정한 분위수 """
+        if not self.count:
+            return float("nan")
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """ 스레드 안전한 메트릭 저장소
+
+    counter: 누적 값 (이름은 _total 로 끝나게), gauge: 마지막 값, histogram: 버킷별 건수/합계/건수.
+    같은 이름이라도 레이블(host, extractor 등) 조합별로 따로 집계된다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = float(value)
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(tuple(buckets))
+            hist.observe(value)
+
+    def value(self, name: str, **labels) -> float:
+        """ counter 또는 gauge 의 현재 값 (없으면 0) """
+        key = _label_key(labels)
+        with self._lock:
+            for kind in (self._counters, self._gauges):
+                if key in kind.get(name, {}):
+                    return kind[name][key]
+        return 0.0
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """ with 블록 소요 시간(초)을 히스토그램에 기록 """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    # --- 내보내기 ---
+    def to_dict(self) -> Dict[str, List[dict]]:
+        """ JSON 직렬화용 스냅샷 (히스토그램은 p50/p90/p99 추정치 포함) """
+        with self._lock:
+            out = {
+                "counters": [{"name": n, "labels": dict(k), "value": v}
+                             for n, s in sorted(self._counters.items()) for k, v in sorted(s.items())],
+                "gauges": [{"name": n, "labels": dict(k), "value": v}
+                           for n, s in sorted(self._gauges.items()) for k, v in sorted(s.items())],
+                "histograms": [],
+            }
+            for n, s in sorted(self._histograms.items()):
+                for k, h in sorted(s.items()):
+                    out["histograms"].append({
+                        "name": n, "labels": dict(k), "count": h.count, "sum": round(h.sum, 6),
+                        "p50": h.quantile(0.5), "p90": h.quantile(0.9), "p99": h.quantile(0.99),
+                        "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts)),
+                    })
+        return out
+
+    def to_prometheus(self) -> str:
+        """ Prometheus text exposition format (0.0.4) """
+        lines = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for n, s in sorted(store.items()):
+                    lines.append(f"# TYPE {n} {kind}")
+                    lines += [f"{n}{_prom_labels(k)} {_prom_value(v)}" for k, v in sorted(s.items())]
+            for n, s in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {n} histogram")
+                for k, h in sorted(s.items()):
+                    cumulative = 0
+                    for bound, count in zip([f"{b:g}" for b in h.buckets] + ["+Inf"], h.counts):
+                        cumulative += count
+                        lines.append(f"{n}_bucket{_prom_labels(k, (('le', bound),))} {cumulative}")
+                    lines.append(f"{n}_sum{_prom_labels(k)} {_prom_value(h.sum)}")
+                    lines.append(f"{n}_count{_prom_labels(k)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """ 확장자가 .prom 이면 Prometheus 텍스트, 그 외에는 JSON 으로 저장 """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".prom"):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """ 프로세스 전체에서 공유하는 메트릭 저장소 """
+    return registry
+
+
+# --- cProfile 훅 ---
+_profiling = False
+_profiles: Dict[str, pstats.Stats] = {}
+_profile_lock = threading.Lock()
+# Python 3.12+ 는 프로세스 전체에서 프로파일러를 하나만 켤 수 있으므로 동시에 한 호출만 측정
+_running = threading.Lock()
+
+
+def enable_profiling(enabled: bool = True):
+    global _profiling
+    _profiling = enabled
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """ 프로파일링이 켜져 있을 때만 함수 호출을 cProfile 로 측정하여 이름별로 누적
+
+    한 번에 한 호출만 측정하며, 다른 호출(다른 스레드 또는 프로파일 중인 함수 안의 중첩 호출)이
+    측정 중이면 측정 없이 그대로 실행한다. 여러 스레드에서 호출되면 일부 호출의 표본이 된다.
+    """
+    def decorator(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _profiling or not _running.acquire(blocking=False):
+                return fn(*args, **kwargs)
+            try:
+                prof = cProfile.Profile()
+                try:
+                    prof.enable()
+                except ValueError:
+                    # 외부 프로파일러(python -m cProfile 등)가 이미 켜져 있음
+                    return fn(*args, **kwargs)
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    prof.disable()
+                    with _profile_lock:
+                        if label in _profiles:
+                            _profiles[label].add(prof)
+                        else:
+                            _profiles[label] = pstats.Stats(prof)
+            finally:
+                _running.release()
+        return wrapper
+    return decorator
+
+
+def dump_profiles(directory: str, top: int = 25) -> List[str]:
+    """ 이름별 누적 프로파일을 .prof(pstats/snakeviz 용)와 누적 시간 상위 .txt 요약으로 저장 """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    with _profile_lock:
+        for label, stats in _profiles.items():
+            base = os.path.join(directory, label.replace(".", "_"))
+            stats.dump_stats(f"{base}.prof")
+            with open(f"{base}.txt", "w", encoding="utf-8") as f:
+                pstats.Stats(f"{base}.prof", stream=f).sort_stats("cumulative").print_stats(top)
+            paths.append(f"{base}.prof")
+    return paths
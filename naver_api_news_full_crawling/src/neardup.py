@@ -0,0 +1,98 @@
+import re
+import zlib
+import numpy as np
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+## 근사 중복 기사 탐지 (MinHash + LSH)
+## - 본문을 문자 5-gram 으로 쪼개 MinHash 서명을 만들고, 서명을 band 로 나눈 버킷에서 후보만 비교
+## - 통신사 기사가 제목/URL 만 바뀌어 여러 번 실리는 경우를 한 기사로 묶음 (전체 쌍 비교 없이 O(n))
+## - shingles / NearDuplicateIndex 는 bert/src/neardup.py 와 같은 코드의 복사본: 크롤러와 분석기는 각 폴더에서
+##   따로 설치·실행되어 공유 패키지가 없으므로 의도적으로 나눠 둠 (MinHash 매개변수를 바꾸면 양쪽을 함께 수정)
+
+_WS = re.compile(r"\s+")
+_PRIME = (1 << 31) - 1  # 해시 순열용 메르센 소수 (곱셈이 uint64 범위를 넘지 않음)
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """ 공백을 정리한 본문의 문자 n-gram 집합 (n 보다 짧으면 빈 집합) """
+    text = _WS.sub(" ", str(text)).strip()
+    if len(text) < size:
+        return set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class NearDuplicateIndex:
+    """ MinHash 서명 + LSH 버킷으로 대표 기사를 관리하는 근사 중복 인덱스
+
+    add 는 처음 보는 기사를 대표로 등록하고, 기존 대표와 추정 Jaccard 유사도가 threshold 이상이면
+    그 대표의 키를 반환한다. 대표 기사의 서명만 보관하며, 새 기사는 같은 버킷에 든 후보하고만 비교한다.
+    기본값(64 순열, 16 band × 4 row)에서 유사도 0.5 부근부터 후보로 잡힌다.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm 은 bands 의 배수여야 합니다")
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)[:, None]
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)[:, None]
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._sigs: Dict[Hashable, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[Hashable]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._sigs)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """ MinHash 서명 (uint32 × num_perm, 너무 짧은 본문은 None) """
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return None
+        h = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        return ((self._a * (h % _PRIME) + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray):
+        r = self.rows
+        return [(i, sig[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def find(self, sig: np.ndarray) -> Optional[Hashable]:
+        """ 같은 버킷 후보 중 유사도가 threshold 이상이면서 가장 높은 대표의 키 """
+        best, best_sim, checked = None, 0.0, set()
+        for band in self._band_keys(sig):
+            for key in self._buckets.get(band, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                sim = float(np.mean(self._sigs[key] == sig))
+                if sim >= self.threshold and sim > best_sim:
+                    best, best_sim = key, sim
+        return best
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """ 근사 중복이면 대표 기사의 키를, 아니면 key 를 대표로 등록하고 None 반환 """
+        sig = self.signature(text)
+        if sig is None:
+            return None
+        dup = self.find(sig)
+        if dup is not None:
+            return dup
+        self._sigs[key] = sig
+        for band in self._band_keys(sig):
+            self._buckets[band].append(key)
+        return None
+
+
+def iter_near_tag(records: Iterable[Dict[str, Any]], index: NearDuplicateIndex) -> Iterator[Dict[str, Any]]:
+    """ 본문(body_full)이 이미 내보낸 기사와 근사 중복인 레코드에 대표 기사의 response_hash 를 표시
+
+    모든 레코드를 그대로 내보내며 near_dup_of 컬럼을 붙인다 (대표 기사는 빈 문자열).
+    처음 등장한 기사가 대표가 되고, 분석기는 이 컬럼으로 대표 한 건과 묶음 크기(cluster_size)를 구한다.
+    """
+    for r in records:
+        dup = index.add(r["response_hash"], r.get("body_full") or "")
+        r["near_dup_of"] = dup or ""
+        yield r
@@ -1,53 +1,106 @@
+import time
 import requests
-from bs4 import BeautifulSoup
 from typing import Tuple, Optional
 
 from .utils import get_browser_headers
+from .session import get_session
+from .cache import ScrapeCache
+from .extract import extract_body
+from .throttle import host_of
+from .health import HostHealth, get_host_health
+from .metrics import registry
 
-# --- 라이브러리 임포트 (없으면 None) ---
-try:
-    import trafilatura
-except ImportError:
-    trafilatura = None
-try:
-    from readability import Document
-except ImportError:
-    Document = None
-
-def scrape_full_body(url: str, referer: Optional[str] = None) -> Tuple[str, str]:
-    """ 다중 레이어 방식으로 기사 본문을 추출 """
+def _extract_body(resp: requests.Response) -> Tuple[str, str]:
+    """ 응답 HTML에서 trafilatura → readability → <body> 순으로 본문 추출
+
+    HTML 은 한 번만 파싱하여 모든 추출기가 공유하고, 도메인별로 성공했던 추출기를 먼저 시도한다.
+    """
+    # 인코딩은 Content-Type / <meta charset> 을 우선 사용하고, 둘 다 없을 때만 본문 전체로 감지
+    return extract_body(resp.content, resp.headers, resp.url,
+                        encoding_fallback=lambda: resp.apparent_encoding)
+
+# 호스트 문제로 보는 응답 상태 (차단 / 과부하 / 서버 오류). 404 등은 기사 단위 문제로 보고 제외
+HOST_FAILURE_STATUS = {403, 429, 500, 502, 503, 504}
+
+def scrape_full_body(url: str, referer: Optional[str] = None,
+                     session: Optional[requests.Session] = None,
+                     cache: Optional[ScrapeCache] = None,
+                     health: Optional[HostHealth] = None) -> Tuple[str, str]:
+    """ 다중 레이어 방식으로 기사 본문을 추출 (session 미지정 시 공유 keep-alive 세션 사용)
+
+    cache 를 넘기면 TTL 이내 항목은 네트워크 없이 반환하고,
+    만료된 항목은 ETag / Last-Modified 조건부 GET 으로 재검증한다.
+    health(미지정 시 공유 추적기)가 호스트를 차단 중이면 요청하지 않고 "circuit_open" 을 반환하며
+    (만료된 캐시 항목이 있으면 그 본문을 반환), 요청 timeout 은 호스트별 응답 시간에 맞춰 정한다.
+    호스트별 요청 지연 시간/바이트 수와 추출 결과(extractor 또는 blocked_403 등)를 메트릭에 기록한다.
+    """
+    host = host_of(url)
+    text, extractor = _scrape(url, host, referer, session, cache, health or get_host_health())
+    registry.inc("scrape_results_total", host=host, extractor=extractor)
+    return text, extractor
+
+def _get(session: requests.Session, url: str, host: str, headers: dict, health: HostHealth) -> requests.Response:
+    """ 호스트별 timeout 으로 GET (SSL 검증에 실패했던 호스트는 바로 verify=False 로 요청) """
+    timeout = health.timeout(host)
+    registry.set("scrape_timeout_seconds", timeout, host=host)
+    if health.is_insecure(host):
+        return session.get(url, headers=headers, timeout=timeout, allow_redirects=True, verify=False)
     try:
-        session = requests.Session()
+        return session.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+    except requests.exceptions.SSLError:
+        resp = session.get(url, headers=headers, timeout=timeout, allow_redirects=True, verify=False)
+        health.mark_insecure(host)
+        return resp
+
+def _scrape(url: str, host: str, referer: Optional[str], session: Optional[requests.Session],
+            cache: Optional[ScrapeCache], health: HostHealth) -> Tuple[str, str]:
+    try:
+        cached = cache.get(url) if cache else None
+        if cached and cached["fresh"]:
+            registry.inc("scrape_cache_total", result="fresh")
+            return cached["body_full"], cached["extractor_used"]
+
+        if not health.allow(host):
+            if cached:
+                registry.inc("scrape_cache_total", result="stale")
+                return cached["body_full"], cached["extractor_used"]
+            return "", "circuit_open"
+
+        session = session or get_session()
         headers = get_browser_headers(referer)
+        if cached:
+            if cached["etag"]: headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]: headers["If-Modified-Since"] = cached["last_modified"]
         
+        start = time.perf_counter()
         try:
-            resp = session.get(url, headers=headers, timeout=10, allow_redirects=True)
-        except requests.exceptions.SSLError:
-            resp = session.get(url, headers=headers, timeout=10, allow_redirects=True, verify=False)
+            resp = _get(session, url, host, headers, health)
+        except requests.exceptions.RequestException as e:
+            health.record_failure(host, type(e).__name__)
+            raise
+        finally:
+            registry.observe("scrape_request_seconds", time.perf_counter() - start, host=host)
+        if resp.status_code in HOST_FAILURE_STATUS:
+            health.record_failure(host, str(resp.status_code))
+        else:
+            health.record_success(host, resp.elapsed.total_seconds())
+        registry.inc("scrape_responses_total", host=host, status=resp.status_code)
+        registry.inc("scrape_bytes_total", len(resp.content), host=host)
+
+        if cached and resp.status_code == 304:
+            registry.inc("scrape_cache_total", result="revalidated")
+            cache.touch(url)
+            return cached["body_full"], cached["extractor_used"]
+        if cache:
+            registry.inc("scrape_cache_total", result="miss")
         
         resp.raise_for_status()
 
-        # ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼-
-        # 인코딩 문제를 해결하기 위해, 콘텐츠 기반으로 인코딩을 명시적으로 설정합니다.
-        resp.encoding = resp.apparent_encoding
-        # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲-
-
-        if trafilatura:
-            text = trafilatura.extract(resp.text, include_comments=False, include_tables=False)
-            if text and len(text) > 100: return text, "trafilatura"
-
-        if Document:
-            doc = Document(resp.text)
-            html_summary = doc.summary()
-            soup = BeautifulSoup(html_summary, "lxml")
-            text = soup.get_text(separator="\n", strip=True)
-            if text and len(text) > 100: return text, "readability"
-
-        soup = BeautifulSoup(resp.text, "lxml")
-        if soup.body:
-            return soup.body.get_text(separator="\n", strip=True), "fallback_body"
-        
-        return "", "extract_failed"
+        text, extractor = _extract_body(resp)
+        if cache and text:
+            cache.put(url, text, extractor,
+                      etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"))
+        return text, extractor
 
     except Exception as e:
         error_msg = str(e)
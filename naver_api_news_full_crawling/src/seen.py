@@ -0,0 +1,61 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional
+
+from .utils import normalize_url
+
+class SeenIndex:
+    """ 이전 실행에서 이미 수집한 기사(response_hash / URL)를 기록하는 SQLite 기반 영구 인덱스
+
+    증분 수집 시 harvest 가 새 기사만 골라내는 데 사용한다.
+    기록(add_records)은 결과 파일 저장 이후에 호출해야 중단 시 기사가 누락되지 않는다.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS seen (
+                key TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _keys(response_hash: Optional[str], url: Optional[str]) -> list:
+        keys = []
+        if response_hash:
+            keys.append(f"hash:{response_hash}")
+        if url:
+            keys.append(f"url:{normalize_url(url)}")
+        return keys
+
+    def contains(self, response_hash: Optional[str] = None, url: Optional[str] = None) -> bool:
+        """ response_hash 또는 URL 중 하나라도 기록되어 있으면 True """
+        keys = self._keys(response_hash, url)
+        if not keys:
+            return False
+        marks = ",".join("?" * len(keys))
+        with self._lock:
+            row = self._conn.execute(f"SELECT 1 FROM seen WHERE key IN ({marks}) LIMIT 1", keys).fetchone()
+        return row is not None
+
+    def add_records(self, records: Iterable[Dict[str, Any]]):
+        """ 저장이 끝난 레코드들의 response_hash / 원문 URL 을 기록 """
+        now = time.time()
+        rows = []
+        for r in records:
+            url = r.get("originallink") or r.get("url")
+            rows.extend((k, now) for k in self._keys(r.get("response_hash"), url))
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?)", rows)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,49 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .config import NAVER_NEWS_URL, POOL_CONNECTIONS, POOL_MAXSIZE, HTTP_RETRIES, HTTP_BACKOFF
+
+def build_session(pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                  retries: int = HTTP_RETRIES, backoff_factor: float = HTTP_BACKOFF,
+                  api_url: str = NAVER_NEWS_URL) -> requests.Session:
+    """ 커넥션 풀과 재시도(backoff) 어댑터가 설정된 keep-alive 세션 생성
+
+    pool_connections: 커넥션 풀을 유지할 호스트 수
+    pool_maxsize: 호스트당 유지할 커넥션 수 (동시 스크래핑 워커 수 이상 권장)
+    재시도 어댑터는 api_url 의 호스트에만 적용하고, 언론사 기사 요청은 재시도하지 않는다
+    (요청 한 번이 HostHealth 의 circuit breaker / timeout 관측 한 건이 되도록 하며, 재시도는 breaker 가 대신함).
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    api_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+    scrape_adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session = requests.Session()
+    session.mount("http://", scrape_adapter)
+    session.mount("https://", scrape_adapter)
+    api = urlsplit(api_url)
+    session.mount(f"{api.scheme}://{api.netloc}/", api_adapter)  # 더 긴 접두어가 우선
+    return session
+
+_default_session: Optional[requests.Session] = None
+_default_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """ 프로세스 전체에서 공유하는 기본 세션 반환 (최초 호출 시 생성) """
+    global _default_session
+    with _default_lock:
+        if _default_session is None:
+            _default_session = build_session()
+        return _default_session
@@ -0,0 +1,165 @@
+import os
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+class CsvSink:
+    """ 레코드를 받는 즉시 CSV 파일에 한 줄씩 기록하는 스트리밍 writer
+
+    append=True 이면 기존 파일 뒤에 이어서 기록한다 (헤더는 기존 파일의 컬럼 순서를 따름).
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.append = append
+        self.count = 0
+        self._f = None
+        self._wr: Optional[csv.DictWriter] = None
+
+    def write(self, record: Dict[str, Any]):
+        if self._wr is None:
+            # 첫 레코드가 들어올 때 파일을 열어, 빈 실행에서는 파일을 만들지 않음
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            if self.append and os.path.exists(self.path) and os.path.getsize(self.path):
+                with open(self.path, newline="", encoding="utf-8-sig") as f:
+                    fieldnames = next(csv.reader(f))
+                self._f = open(self.path, "a", newline="", encoding="utf-8-sig")
+                # 기존 파일에 없는 컬럼은 버림 (이전 버전으로 수집하던 파일에 이어 쓰는 경우)
+                self._wr = csv.DictWriter(self._f, fieldnames=fieldnames, extrasaction="ignore")
+            else:
+                self._f = open(self.path, "w", newline="", encoding="utf-8-sig")
+                self._wr = csv.DictWriter(self._f, fieldnames=list(record.keys()))
+                self._wr.writeheader()
+        self._wr.writerow(record)
+        self._f.flush()
+        self.count += 1
+
+    def close(self):
+        if self._f:
+            self._f.close()
+
+class JsonlSink:
+    """ 레코드를 받는 즉시 JSON Lines 파일에 한 줄씩 기록하는 스트리밍 writer (append=True 이면 이어서 기록) """
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.append = append
+        self.count = 0
+        self._f = None
+
+    def write(self, record: Dict[str, Any]):
+        if self._f is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(self.path, "a" if self.append else "w", encoding="utf-8")
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        self.count += 1
+
+    def close(self):
+        if self._f:
+            self._f.close()
+
+class ParquetSink:
+    """ row_group_size 건마다 row group 을 flush 하는 스트리밍 Parquet writer
+
+    pyarrow 가 없거나 쓰기에 실패하면 경고만 출력하고 이후 레코드는 무시한다.
+    append=True 이고 기존 파일이 있으면 임시 파일에 기존 row group 을 하나씩 옮겨 적은 뒤
+    이어서 기록하고, close() 시 원래 경로로 교체한다 (Parquet 은 파일 끝에 덧붙일 수 없음).
+    비정상 종료로 footer 가 없는 기존 파일은 덮어쓰지 않고 path.broken 으로 옮긴 뒤,
+    source_csv(매 레코드 flush 되는 같은 수집의 CSV)가 있으면 그 내용으로 다시 만든다.
+    """
+
+    def __init__(self, path: str, row_group_size: int = 100, append: bool = False,
+                 source_csv: Optional[str] = None):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.append = append
+        self.source_csv = source_csv
+        self.count = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer = None
+        self._tmp: Optional[str] = None  # append 시 기존 row group 을 옮겨 적는 임시 파일
+        self._schema = None
+        self._failed = False
+        if append and os.path.exists(path):
+            # CSV 에 이번 실행의 레코드가 붙기 전에 복구해야 함
+            self._recover()
+
+    def _recover(self):
+        """ 기존 파일을 읽을 수 없으면 옆으로 옮기고 source_csv 로 다시 작성 """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            try:
+                pq.ParquetFile(self.path)
+                return
+            except Exception as e:
+                error = e
+            broken = f"{self.path}.broken"
+            os.replace(self.path, broken)
+            if not (self.source_csv and os.path.exists(self.source_csv)):
+                print(f"[warn] 기존 Parquet 파일을 읽을 수 없어 {broken} 로 옮기고 새로 작성합니다: {error}")
+                return
+            tmp = f"{self.path}.tmp"
+            rows = 0
+            with open(self.source_csv, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                schema = pa.schema([(k, pa.string()) for k in reader.fieldnames or []])
+                with pq.ParquetWriter(tmp, schema) as writer:
+                    batch: List[Dict[str, Any]] = []
+                    for row in reader:
+                        batch.append(row)
+                        if len(batch) >= self.row_group_size:
+                            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                            rows += len(batch)
+                            batch = []
+                    if batch:
+                        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                        rows += len(batch)
+            os.replace(tmp, self.path)
+            print(f"[warn] 기존 Parquet 파일을 읽을 수 없어 {broken} 로 옮기고 {self.source_csv} 의 {rows}건으로 다시 작성했습니다: {error}")
+        except Exception as e:
+            print(f"[warn] Parquet 복구 실패: {e}")
+            self._failed = True
+
+    def write(self, record: Dict[str, Any]):
+        if self._failed: return
+        self._buffer.append(record)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer or self._failed: return
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._writer is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                if self.append and os.path.exists(self.path):
+                    self._open_append(pq)
+                if self._writer is None:
+                    # 레코드 값은 모두 문자열(또는 None)이므로 스키마를 string 으로 고정
+                    self._schema = pa.schema([(k, pa.string()) for k in self._buffer[0].keys()])
+                    self._writer = pq.ParquetWriter(self.path, self._schema)
+            self._writer.write_table(pa.Table.from_pylist(self._buffer, schema=self._schema))
+            self.count += len(self._buffer)
+        except Exception as e:
+            print(f"[warn] Parquet 저장 실패: {e}")
+            self._failed = True
+        self._buffer = []
+
+    def _open_append(self, pq):
+        existing = pq.ParquetFile(self.path)  # 읽을 수 없는 파일은 생성 시 _recover 가 이미 교체함
+        self._schema = existing.schema_arrow
+        self._tmp = f"{self.path}.tmp"
+        self._writer = pq.ParquetWriter(self._tmp, self._schema)
+        for i in range(existing.num_row_groups):
+            self._writer.write_table(existing.read_row_group(i))
+
+    def close(self):
+        self._flush()
+        if self._writer:
+            self._writer.close()
+            if self._tmp:
+                os.replace(self._tmp, self.path)
@@ -0,0 +1,40 @@
+import time
+import random
+import threading
+from urllib.parse import urlparse
+from typing import Dict, Optional, Tuple
+
+def host_of(url: str) -> str:
+    """ URL에서 호스트(도메인) 추출 """
+    return (urlparse(url).hostname or "").lower()
+
+class HostThrottle:
+    """ 호스트(도메인)별 최소 요청 간격을 보장하는 스케줄러
+
+    서로 다른 호스트에 대한 요청은 기다리지 않고 바로 진행되며,
+    같은 호스트에 대한 요청만 interval(+ jitter) 간격으로 정렬된다.
+    여러 스레드에서 동시에 사용해도 안전하다.
+    """
+
+    def __init__(self, interval: Tuple[float, float] = (1.0, 2.0),
+                 overrides: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.interval = interval
+        self.overrides = {h.lower(): v for h, v in (overrides or {}).items()}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _interval_for(self, host: str) -> float:
+        low, high = self.overrides.get(host, self.interval)
+        return random.uniform(low, high)
+
+    def wait(self, url: str) -> float:
+        """ 해당 URL의 호스트 차례가 올 때까지 대기하고, 대기한 시간(초)을 반환 """
+        host = host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self._interval_for(host)
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
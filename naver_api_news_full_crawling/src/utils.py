@@ -2,7 +2,8 @@ import os
 import html
 import hashlib
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 
 from .config import KST
 
@@ -41,6 +42,13 @@ def strip_html_tags(s: str) -> str:
     s = html.unescape(s or "")
     return s.replace("<b>", "").replace("</b>", "").strip()
 
+def parse_pubdate(pubdate: str) -> Optional[datetime]:
+    """ API의 pubDate 문자열을 timezone 포함 datetime 으로 변환 (실패 시 None) """
+    try:
+        return datetime.strptime(pubdate, "%a, %d %b %Y %H:%M:%S %z")
+    except Exception:
+        return None
+
 def parse_pubdate_to_kst(pubdate: str) -> str:
     """ API에서 받은 날짜 문자열을 KST 시간대로 변환 """
     try:
@@ -54,13 +62,24 @@ def sha256_of_item(item: Dict[str, Any]) -> str:
     raw = repr(sorted(item.items())).encode("utf-8", errors="ignore")
     return hashlib.sha256(raw).hexdigest()
 
-def dedupe(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """ URL과 제목 기준으로 기사 중복 제거 """
-    seen = set()
-    out = []
+def normalize_url(url: str) -> str:
+    """ 캐시/중복 판정용 URL 정규화 (스킴·호스트 소문자, 프래그먼트·추적 파라미터 제거, 쿼리 정렬) """
+    parts = urlsplit((url or "").strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith("utm_"))
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+def iter_dedupe(records: Iterable[Dict[str, Any]],
+                seen: Optional[Set[Tuple[str, str]]] = None) -> Iterator[Dict[str, Any]]:
+    """ URL과 제목 기준으로 기사 중복을 스트리밍으로 제거 (seen 에 이미 저장한 (url, title) 을 넘길 수 있음) """
+    seen = set() if seen is None else seen
     for r in records:
         key = (r["url"], r["title"])
         if key in seen: continue
         seen.add(key)
-        out.append(r)
-    return out
\ No newline at end of file
+        yield r
+
+def dedupe(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """ URL과 제목 기준으로 기사 중복 제거 """
+    return list(iter_dedupe(records))
\ No newline at end of file
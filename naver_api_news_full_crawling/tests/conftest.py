@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+import requests
+
+from src import collector
+from src.cache import ScrapeCache
+from src.health import HostHealth
+from src.throttle import HostThrottle
+
+def make_items(n: int, prefix: str = "a"):
+    """ 최신순으로 정렬된 가짜 API 아이템 n 건 (호스트는 언론사 두 곳에 번갈아 배정) """
+    return [{
+        "title": f"<b>기사 {prefix}{i}</b>",
+        "description": f"요약 {prefix}{i}",
+        "link": f"https://n.news.naver.com/article/{prefix}{i}",
+        "originallink": f"https://press{i % 2}.example.com/news/{prefix}{i}",
+        "pubDate": "Sat, 17 Oct 2026 09:00:00 +0900",
+    } for i in range(n)]
+
+class FakeNaver:
+    """ request_news / scrape_full_body 대체 (호출 횟수 기록) """
+
+    def __init__(self, items):
+        self.items = items
+        self.api_calls = 0
+        self.scraped = []
+
+    def request_news(self, query, display, start, sort, headers, session=None):
+        self.api_calls += 1
+        return {"items": self.items[start - 1:start - 1 + display]}
+
+    def scrape_full_body(self, url, referer=None, session=None, cache=None, health=None):
+        self.scraped.append(url)
+        return f"{url} 본문", "fake"
+
+@pytest.fixture
+def fake_naver(monkeypatch):
+    """ 네트워크 없이 harvest 를 실행하도록 API/스크래핑/대기를 대체 """
+    def install(items):
+        fake = FakeNaver(items)
+        monkeypatch.setattr(collector, "request_news", fake.request_news)
+        monkeypatch.setattr(collector, "scrape_full_body", fake.scrape_full_body)
+        monkeypatch.setattr(collector, "_api_headers", lambda: {})
+        return fake
+    return install
+
+@pytest.fixture
+def harvest_kwargs():
+    """ 요청 간격 없이 단일 스레드로 수집하는 harvest 공통 인자 """
+    return dict(workers=1, throttle=HostThrottle((0.0, 0.0)), session=object(), health=HostHealth())
+
+class FakeSession:
+    """ 정해진 상태 코드로 응답하고 요청 헤더를 기록하는 세션 """
+
+    def __init__(self, status_code: int, content: bytes = b""):
+        self.status_code = status_code
+        self.content = content
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        resp = requests.Response()
+        resp.status_code = self.status_code
+        resp._content = self.content
+        resp.url = url
+        resp.headers["Content-Type"] = "text/html; charset=utf-8"
+        resp.elapsed = timedelta(seconds=0.1)
+        return resp
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ScrapeCache(str(tmp_path / "scrape_cache.sqlite"), ttl_sec=60)
+    yield cache
+    cache.close()
+
+def expire(cache: ScrapeCache):
+    """ 캐시 항목을 모두 TTL 이 지난 상태로 만듦 """
+    cache._conn.execute("UPDATE scrape_cache SET fetched_at = fetched_at - 3600")
+    cache._conn.commit()
@@ -0,0 +1,37 @@
+from src.health import HostHealth
+from src.scraper import scrape_full_body
+
+from conftest import FakeSession, expire
+
+URL = "https://press.example.com/news/1"
+HTML = ("<html><head><title>기사</title></head><body><article><p>"
+        + "삼성전자가 3분기 반도체 수출 실적을 발표했다. " * 20 + "</p></article></body></html>").encode("utf-8")
+
+def test_not_modified_returns_cached_body_and_extends_ttl(cache):
+    cache.put(URL, "캐시된 본문", "trafilatura", etag='"v1"', last_modified="Sat, 17 Oct 2026 00:00:00 GMT")
+    expire(cache)
+    assert not cache.is_fresh(URL)
+    session = FakeSession(304)
+
+    text, extractor = scrape_full_body(URL, session=session, cache=cache, health=HostHealth())
+
+    assert (text, extractor) == ("캐시된 본문", "trafilatura")
+    assert session.requests[0]["If-None-Match"] == '"v1"'
+    assert session.requests[0]["If-Modified-Since"] == "Sat, 17 Oct 2026 00:00:00 GMT"
+    assert cache.is_fresh(URL)
+
+def test_fresh_entry_skips_network(cache):
+    cache.put(URL, "캐시된 본문", "trafilatura", etag='"v1"')
+    session = FakeSession(200)
+
+    assert scrape_full_body(URL, session=session, cache=cache, health=HostHealth()) == ("캐시된 본문", "trafilatura")
+    assert session.requests == []
+
+def test_miss_extracts_and_stores_body(cache):
+    session = FakeSession(200, HTML)
+
+    text, _ = scrape_full_body(URL + "?utm_source=feed", session=session, cache=cache, health=HostHealth())
+
+    assert "반도체 수출" in text
+    assert "If-None-Match" not in session.requests[0]
+    assert cache.get(URL)["body_full"] == text  # 추적 파라미터를 제거한 URL 로 저장
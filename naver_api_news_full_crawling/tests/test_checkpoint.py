@@ -0,0 +1,65 @@
+from src.collector import harvest
+from src.checkpoint import HarvestCheckpoint
+from src.utils import sha256_of_item
+
+from conftest import make_items
+
+PARAMS = {"queries": ["반도체"], "max_items": 25, "sort": "date", "per_page": 10}
+
+def test_checkpoint_resume_skips_done_items(tmp_path, fake_naver, harvest_kwargs):
+    items = make_items(30)
+    fake = fake_naver(items)
+    path = str(tmp_path / "checkpoint.json")
+
+    checkpoint = HarvestCheckpoint(path, every=5)
+    assert not checkpoint.begin(PARAMS)
+    records = harvest("반도체", 25, "date", 10, checkpoint=checkpoint, **harvest_kwargs)
+    first = [next(records)["response_hash"] for _ in range(13)]
+    records.close()         # 13번째 기사를 받은 직후 중단 (처리 완료는 12건)
+    checkpoint.close()
+    assert checkpoint.done_count == 12
+
+    fake.scraped.clear()
+    checkpoint = HarvestCheckpoint(path, every=5)
+    assert checkpoint.begin(PARAMS)
+    resumed = [r["response_hash"] for r in harvest("반도체", 25, "date", 10, checkpoint=checkpoint, **harvest_kwargs)]
+    checkpoint.close()
+
+    expected = [sha256_of_item(it) for it in items[:25]]
+    assert set(first[:12]).isdisjoint(resumed)
+    assert first[:12] + resumed == expected
+    assert len(fake.scraped) == len(resumed) == 13
+
+def test_checkpoint_with_other_params_starts_over(tmp_path, fake_naver, harvest_kwargs):
+    fake_naver(make_items(30))
+    path = str(tmp_path / "checkpoint.json")
+
+    checkpoint = HarvestCheckpoint(path)
+    checkpoint.begin(PARAMS)
+    records = harvest("반도체", 25, "date", 10, checkpoint=checkpoint, **harvest_kwargs)
+    for _ in range(5):
+        next(records)
+    records.close()
+    checkpoint.close()
+
+    checkpoint = HarvestCheckpoint(path)
+    assert not checkpoint.begin(dict(PARAMS, max_items=30))
+    assert checkpoint.done_count == 0 and checkpoint.cursor("반도체") == (1, 0)
+    checkpoint.close()
+
+def test_done_log_survives_without_close(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    checkpoint = HarvestCheckpoint(path, every=2)
+    checkpoint.begin(PARAMS)
+    checkpoint.set_pending([({"link": "a"}, ["반도체"])])
+    for key in ("h1", "h2", "h3"):
+        checkpoint.mark_done(key)
+    checkpoint.advance("반도체", 11, 10)  # close() 없이 종료된 상황
+
+    resumed = HarvestCheckpoint(path)
+    assert resumed.begin(PARAMS)
+    assert resumed.is_done("h1") and resumed.is_done("h3")
+    assert resumed.cursor("반도체") == (11, 10)
+    assert resumed.pending == [[{"link": "a"}, ["반도체"]]]
+    resumed.clear()
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from src.collector import harvest
+from src.config import KST
+
+from conftest import make_items
+
+def _dated(items, start: datetime):
+    """ 최신순으로 한 시간 간격의 pubDate 부여 """
+    for i, it in enumerate(items):
+        it["pubDate"] = (start - timedelta(hours=i)).strftime("%a, %d %b %Y %H:%M:%S %z")
+    return items
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=KST)
+
+def test_stops_at_publish_date_cutoff(fake_naver, harvest_kwargs):
+    fake = fake_naver(_dated(make_items(50), NOW))
+    stop_reasons = {}
+
+    records = list(harvest("반도체", 100, "date", 10, published_after=NOW - timedelta(hours=14.5),
+                           stop_reasons=stop_reasons, **harvest_kwargs))
+
+    assert len(records) == 15
+    assert fake.api_calls == 2
+    assert stop_reasons == {"반도체": "cutoff"}
+
+def test_reports_max_items_and_exhausted(fake_naver, harvest_kwargs):
+    fake_naver(_dated(make_items(25), NOW))
+    stop_reasons = {}
+    list(harvest("반도체", 20, "date", 10, stop_reasons=stop_reasons, **harvest_kwargs))
+    list(harvest("증권", 100, "date", 10, stop_reasons=stop_reasons, **harvest_kwargs))
+
+    assert stop_reasons == {"반도체": "max_items", "증권": "exhausted"}
+
+def test_interrupted_harvest_reports_nothing(fake_naver, harvest_kwargs):
+    fake_naver(_dated(make_items(25), NOW))
+    stop_reasons = {}
+    records = harvest("반도체", 100, "date", 10, stop_reasons=stop_reasons, **harvest_kwargs)
+    next(records)
+    records.close()
+
+    assert stop_reasons == {}
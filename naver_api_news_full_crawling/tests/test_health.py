@@ -0,0 +1,86 @@
+import pytest
+
+from src import health as health_mod
+from src.health import HostHealth
+
+HOST = "press.example.com"
+
+@pytest.fixture
+def clock(monkeypatch):
+    """ time.monotonic 을 대체하는 수동 시계 """
+    now = [1000.0]
+    monkeypatch.setattr(health_mod.time, "monotonic", lambda: now[0])
+    return now
+
+def test_trips_after_consecutive_failures(clock):
+    health = HostHealth(failures=3, cooldown=10, max_cooldown=100)
+    for _ in range(2):
+        health.record_failure(HOST)
+    assert health.allow(HOST) and not health.is_open(HOST)
+
+    health.record_failure(HOST)
+    assert health.is_open(HOST)
+    assert not health.allow(HOST)
+
+def test_success_resets_failure_count(clock):
+    health = HostHealth(failures=2, cooldown=10)
+    health.record_failure(HOST)
+    health.record_success(HOST, 0.1)
+    health.record_failure(HOST)
+    assert health.allow(HOST)
+
+def test_single_probe_after_cooldown(clock):
+    health = HostHealth(failures=1, cooldown=10)
+    health.record_failure(HOST)
+    clock[0] += 9.9
+    assert not health.allow(HOST)
+
+    clock[0] += 0.1
+    assert health.allow(HOST)       # 시험 요청 한 건
+    assert not health.allow(HOST)   # 시험 요청 결과가 나오기 전에는 차단 유지
+    assert health.is_open(HOST)
+
+    health.record_success(HOST, 0.2)
+    assert health.allow(HOST) and not health.is_open(HOST)
+
+def test_failed_probe_doubles_cooldown_up_to_max(clock):
+    health = HostHealth(failures=1, cooldown=10, max_cooldown=25)
+    health.record_failure(HOST)
+    for cooldown in (10, 20, 25, 25):
+        clock[0] += cooldown - 0.1
+        assert not health.allow(HOST)
+        clock[0] += 0.1
+        assert health.allow(HOST)   # 시험 요청
+        health.record_failure(HOST) # 시험 요청 실패 → 다음 cool-down 은 두 배 (max_cooldown 이하)
+
+def test_cooldown_resets_after_successful_probe(clock):
+    health = HostHealth(failures=1, cooldown=10, max_cooldown=100)
+    health.record_failure(HOST)
+    clock[0] += 10
+    assert health.allow(HOST)
+    health.record_failure(HOST)     # cool-down 20초
+    clock[0] += 20
+    assert health.allow(HOST)
+    health.record_success(HOST, 0.1)
+
+    health.record_failure(HOST)     # 다시 기본 cool-down 10초부터
+    clock[0] += 10
+    assert health.allow(HOST)
+
+def test_failures_while_open_do_not_extend_cooldown(clock):
+    health = HostHealth(failures=1, cooldown=10)
+    health.record_failure(HOST)
+    clock[0] += 5
+    health.record_failure(HOST)     # 차단 전에 보낸 요청의 실패
+    clock[0] += 5
+    assert health.allow(HOST)
+
+def test_timeout_follows_latency(clock):
+    health = HostHealth(default_timeout=10, min_timeout=3, max_timeout=10, multiplier=3, min_samples=5)
+    assert health.timeout(HOST) == 10
+    for _ in range(5):
+        health.record_success(HOST, 0.5)
+    assert health.timeout(HOST) == 3
+    for _ in range(5):
+        health.record_success(HOST, 2.0)
+    assert health.timeout(HOST) == 6
@@ -0,0 +1,26 @@
+from src.health import HostHealth
+from src.scraper import scrape_full_body
+
+from conftest import FakeSession, expire
+
+URL = "https://press.example.com/news/1"
+
+def test_open_circuit_serves_stale_entry_without_request(cache):
+    cache.put(URL, "캐시된 본문", "trafilatura", etag='"v1"')
+    expire(cache)
+    health = HostHealth(failures=1, cooldown=60)
+    health.record_failure("press.example.com")
+    session = FakeSession(304)
+
+    assert scrape_full_body(URL, session=session, cache=cache, health=health) == ("캐시된 본문", "trafilatura")
+    assert scrape_full_body(URL + "/other", session=session, cache=cache, health=health) == ("", "circuit_open")
+    assert session.requests == []
+
+def test_host_failure_status_counts_toward_breaker(cache):
+    health = HostHealth(failures=2, cooldown=60)
+    session = FakeSession(503)
+
+    for _ in range(2):
+        assert scrape_full_body(URL, session=session, cache=cache, health=health)[0] == ""
+    assert scrape_full_body(URL, session=session, cache=cache, health=health) == ("", "circuit_open")
+    assert len(session.requests) == 2
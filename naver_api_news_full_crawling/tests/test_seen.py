@@ -0,0 +1,43 @@
+from src.collector import harvest
+from src.seen import SeenIndex
+from src.utils import sha256_of_item
+
+from conftest import make_items
+
+def _seen_keys(items):
+    return [{"response_hash": sha256_of_item(it), "originallink": it["originallink"]} for it in items]
+
+def test_seen_index_matches_hash_or_normalized_url(tmp_path):
+    seen = SeenIndex(str(tmp_path / "seen.sqlite"))
+    seen.add_records([{"response_hash": "h1", "originallink": "https://Press.example.com/a?utm_source=x"},
+                      {"response_hash": "h2", "originallink": None, "url": "https://n.news.naver.com/b"}])
+
+    assert seen.contains("h1")
+    assert seen.contains(None, "https://press.example.com/a")
+    assert seen.contains("other", "https://n.news.naver.com/b")
+    assert not seen.contains("h3", "https://press.example.com/c")
+    seen.close()
+
+def test_incremental_stops_on_page_of_seen_items(tmp_path, fake_naver, harvest_kwargs):
+    new, old = make_items(5, "new"), make_items(20, "old")
+    fake = fake_naver(new + old)
+    seen = SeenIndex(str(tmp_path / "seen.sqlite"))
+    seen.add_records(_seen_keys(old))
+
+    records = list(harvest("반도체", 100, "date", 5, seen_index=seen, **harvest_kwargs))
+    seen.close()
+
+    assert [r["response_hash"] for r in records] == [sha256_of_item(it) for it in new]
+    assert fake.api_calls == 2  # 새 기사 페이지 + 모두 이미 수집한 페이지에서 종료
+
+def test_incremental_keeps_paging_when_not_sorted_by_date(tmp_path, fake_naver, harvest_kwargs):
+    new, old = make_items(5, "new"), make_items(20, "old")
+    fake = fake_naver(old[:5] + new + old[5:])
+    seen = SeenIndex(str(tmp_path / "seen.sqlite"))
+    seen.add_records(_seen_keys(old))
+
+    records = list(harvest("반도체", 100, "sim", 5, seen_index=seen, **harvest_kwargs))
+    seen.close()
+
+    assert len(records) == 5
+    assert fake.api_calls == 6  # 관련도순은 페이지 순서가 발행일과 무관하므로 끝까지 조회
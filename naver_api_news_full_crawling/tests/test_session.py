@@ -0,0 +1,52 @@
+import socket
+import threading
+import time
+
+import pytest
+import requests
+
+from src.session import build_session
+
+API_URL = "https://openapi.naver.com/v1/search/news.json"
+
+def test_retries_only_for_api_host():
+    session = build_session(retries=2, api_url=API_URL)
+
+    assert session.get_adapter(API_URL).max_retries.total == 2
+    assert session.get_adapter("https://press.example.com/news/1").max_retries.total == 0
+    assert session.get_adapter("http://openapi.naver.com.evil.example/").max_retries.total == 0
+
+@pytest.fixture
+def silent_server():
+    """ 연결은 받되 응답하지 않는 서버 (연결 수를 기록) """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(8)
+    accepted, conns = [], []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            accepted.append(conn)
+            conns.append(conn)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}/news/1", accepted
+    sock.close()
+    for conn in conns:
+        conn.close()
+
+def test_article_read_timeout_is_single_attempt(silent_server):
+    url, accepted = silent_server
+    session = build_session(api_url=API_URL)
+
+    start = time.perf_counter()
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        session.get(url, timeout=0.3)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6
+    assert len(accepted) == 1
@@ -0,0 +1,59 @@
+import os
+
+import pyarrow.parquet as pq
+
+from src.sinks import CsvSink, ParquetSink
+
+def _record(i: int):
+    return {"response_hash": f"h{i}", "title": f"기사 {i}", "body_full": f"본문 {i}", "near_dup_of": None}
+
+def _write_crashed(tmp_path, n: int):
+    """ CSV 는 n 건 모두 남고 Parquet 은 footer 가 잘린 강제 종료 상태를 만듦 """
+    csv_path, parquet_path = str(tmp_path / "out.csv"), str(tmp_path / "out.parquet")
+    csv_sink = CsvSink(csv_path)
+    parquet_sink = ParquetSink(parquet_path, row_group_size=10)
+    for i in range(n):
+        csv_sink.write(_record(i))
+        parquet_sink.write(_record(i))
+    csv_sink.close()
+    parquet_sink.close()
+    with open(parquet_path, "r+b") as f:
+        f.truncate(os.path.getsize(parquet_path) - 8)  # footer 길이 + 매직 바이트 제거
+    return csv_path, parquet_path
+
+def test_append_rebuilds_unreadable_parquet_from_csv(tmp_path):
+    csv_path, parquet_path = _write_crashed(tmp_path, 35)
+
+    csv_sink = CsvSink(csv_path, append=True)
+    parquet_sink = ParquetSink(parquet_path, row_group_size=10, append=True, source_csv=csv_path)
+    for i in range(35, 40):
+        csv_sink.write(_record(i))
+        parquet_sink.write(_record(i))
+    csv_sink.close()
+    parquet_sink.close()
+
+    table = pq.read_table(parquet_path)
+    assert table.column("response_hash").to_pylist() == [f"h{i}" for i in range(40)]
+    assert os.path.exists(f"{parquet_path}.broken")
+
+def test_append_without_new_records_still_repairs(tmp_path):
+    csv_path, parquet_path = _write_crashed(tmp_path, 12)
+
+    ParquetSink(parquet_path, append=True, source_csv=csv_path).close()
+
+    assert pq.read_table(parquet_path).num_rows == 12
+
+def test_append_keeps_existing_row_groups(tmp_path):
+    parquet_path = str(tmp_path / "out.parquet")
+    sink = ParquetSink(parquet_path, row_group_size=4)
+    for i in range(6):
+        sink.write(_record(i))
+    sink.close()
+
+    sink = ParquetSink(parquet_path, row_group_size=4, append=True)
+    for i in range(6, 9):
+        sink.write(_record(i))
+    sink.close()
+
+    assert pq.read_table(parquet_path).column("response_hash").to_pylist() == [f"h{i}" for i in range(9)]
+    assert not os.path.exists(f"{parquet_path}.broken")
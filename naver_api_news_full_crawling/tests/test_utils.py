@@ -0,0 +1,7 @@
+from src.utils import iter_dedupe
+
+def test_iter_dedupe_skips_seeded_keys():
+    records = [{"url": f"u{i}", "title": f"t{i}"} for i in range(5)]
+    seen = {("u0", "t0"), ("u3", "t3")}
+
+    assert [r["url"] for r in iter_dedupe(records + records[:2], seen=seen)] == ["u1", "u2", "u4"]